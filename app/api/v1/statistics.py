@@ -4,7 +4,7 @@ from typing import Dict, List, Optional
 
 from core.database import get_db
 from core.logger import get_logger, setup_logger
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from schemas.statistics import (CalculationType, MetricType, StatisticsRequest,
                                 StatisticsResponse, TimeUnit)
 from services.statistics_service import statistics_service
@@ -14,16 +14,19 @@ router = APIRouter(prefix="/statistics", tags=["statistics"])
 setup_logger()
 logger = get_logger(__name__, "stats_api")
 
+# 字段列表参数允许的最大长度
+MAX_FIELD_COUNT = 50
+
 
 @router.get("", response_model=StatisticsResponse, summary="获取统计数据")
 async def get_statistics(
     site_id: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    metrics: List[MetricType] = Query(default=list(MetricType)),
-    include_fields: Optional[List[str]] = Query(default=None),
-    exclude_fields: Optional[List[str]] = Query(default=None),
-    group_by: Optional[List[str]] = Query(default=None),
+    metrics: List[MetricType] = Query(default=list(MetricType), max_length=len(MetricType)),
+    include_fields: Optional[List[str]] = Query(default=None, max_length=MAX_FIELD_COUNT),
+    exclude_fields: Optional[List[str]] = Query(default=None, max_length=MAX_FIELD_COUNT),
+    group_by: Optional[List[str]] = Query(default=None, max_length=MAX_FIELD_COUNT),
     time_unit: TimeUnit = TimeUnit.DAY,
     calculation: CalculationType = CalculationType.LAST,
     db: AsyncSession = Depends(get_db)
@@ -117,7 +120,8 @@ async def get_statistics(
         response = await statistics_service.get_statistics(db, request)
         
         logger.info("统计数据获取成功")
-        return response
+        # 直接由 pydantic-core 序列化为 JSON，跳过 FastAPI 对返回值的二次校验和编码
+        return Response(content=response.model_dump_json(), media_type="application/json")
         
     except Exception as e:
         error_msg = f"获取统计数据失败: {str(e)}"
@@ -2,31 +2,42 @@ import uuid
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from core.database import get_db
+from core.database import get_db, get_sync_db
 from core.logger import get_logger, setup_logger
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
 from models.models import Crawler, CrawlerConfig, Task, TaskStatus
+from pydantic import TypeAdapter
 from schemas.task import TaskCreate, TaskResponse, TaskUpdate
-from services.managers.process_manager import ProcessManager
-from services.managers.queue_manager import QueueManager
+from services.managers.process_manager import ProcessManager, process_manager
+from services.managers.queue_manager import QueueManager, queue_manager
 from services.managers.site_manager import SiteManager
-from sqlalchemy import select
+from sqlalchemy import case, func, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 logger = get_logger(__name__, "task_api")
 
+# 任务列表单次返回的最大数量
+MAX_LIST_LIMIT = 500
+
+# 任务列表序列化器，结果直接编码为 JSON 字节
+_TASK_LIST_ADAPTER = TypeAdapter(List[TaskResponse])
+
 def get_site_manager():
     return SiteManager.get_instance()
 
 def get_process_manager():
-    return ProcessManager()
+    return process_manager
+
+def get_queue_manager():
+    return queue_manager
 
 @router.post("/retry-failed", response_model=List[TaskResponse], summary="重试所有站点的最近失败任务")
 async def retry_failed_tasks(
     db: AsyncSession = Depends(get_db),
     site_manager: SiteManager = Depends(get_site_manager),
-    queue_manager: QueueManager = Depends(lambda: QueueManager())
+    queue_manager: QueueManager = Depends(get_queue_manager)
 ) -> List[TaskResponse]:
     """
     获取每个站点最近的失败/取消任务并重新添加到队列中
@@ -36,33 +47,50 @@ async def retry_failed_tasks(
     """
     try:
         logger.info("开始处理重试失败/取消任务请求")
-        responses = []
+        task_creates = []
         
         # 1. 获取所有可用站点
         sites = await site_manager.get_available_sites()
         logger.debug(f"获取到 {len(sites)} 个站点")
         
-        # 2. 对每个站点获取最近的任务
+        # 整批任务共用同一创建时间和时间戳
+        current_time = datetime.now()
+        time_str = current_time.strftime('%Y%m%d-%H%M%S')
+        
+        # 2. 一次查询获取已启用的站点
+        result = await db.execute(
+            select(CrawlerConfig.site_id).where(
+                CrawlerConfig.site_id.in_(list(sites.keys())),
+                CrawlerConfig.enabled.is_(True)
+            )
+        )
+        enabled_site_ids = set(result.scalars().all())
+        
+        # 3. 一次查询获取每个已启用站点最近的任务（不考虑状态）
+        ranked = (
+            select(
+                Task.task_id,
+                Task.site_id,
+                Task.status,
+                Task.task_metadata,
+                func.row_number().over(
+                    partition_by=Task.site_id,
+                    order_by=Task.created_at.desc()
+                ).label("rn")
+            )
+            .where(Task.site_id.in_(enabled_site_ids))
+            .subquery()
+        )
+        result = await db.execute(select(ranked).where(ranked.c.rn == 1))
+        latest_tasks = {row.site_id: row for row in result.all()}
+        
         for site_id in sites.keys():
             try:
-                # 检查站点配置是否启用
-                stmt = select(CrawlerConfig).where(CrawlerConfig.site_id == site_id)
-                result = await db.execute(stmt)
-                crawler_config = result.scalar_one_or_none()
-                
-                if not crawler_config or not crawler_config.enabled:
+                if site_id not in enabled_site_ids:
                     logger.debug(f"站点 {site_id} 已禁用或未配置，跳过重试")
                     continue
                 
-                # 先查询该站点最近的任务（不考虑状态）
-                stmt = (
-                    select(Task)
-                    .where(Task.site_id == site_id)
-                    .order_by(Task.created_at.desc())
-                    .limit(1)
-                )
-                result = await db.execute(stmt)
-                latest_task = result.scalar_one_or_none()
+                latest_task = latest_tasks.get(site_id)
                 
                 # 如果找到最近的任务且状态为失败，则重试
                 if latest_task and (latest_task.status == TaskStatus.FAILED or latest_task.status == TaskStatus.CANCELLED):
@@ -70,8 +98,7 @@ async def retry_failed_tasks(
                     logger.debug(f"站点 {site_id} 的最近任务 {latest_task.task_id} 状态为失败/取消，准备重试")
                     
                     # 生成新的任务ID
-                    current_time = datetime.now()
-                    new_task_id = f"{site_id}-{current_time.strftime('%Y%m%d-%H%M%S')}-{str(uuid.uuid4())[:4]}"
+                    new_task_id = f"{site_id}-{time_str}-{str(uuid.uuid4())[:4]}"
                     
                     # 创建新任务
                     task_create = TaskCreate(
@@ -83,13 +110,7 @@ async def retry_failed_tasks(
                         task_metadata=latest_task.task_metadata  # 保留原任务的元数据
                     )
                     
-                    # 添加到队列
-                    response = await queue_manager.add_task(task_create, db)
-                    if response:
-                        responses.append(response)
-                        logger.info(f"站点 {site_id} 的重试任务已添加到队列: {new_task_id}")
-                    else:
-                        logger.error(f"站点 {site_id} 的重试任务添加失败")
+                    task_creates.append(task_create)
                 else:
                     if not latest_task:
                         logger.debug(f"站点 {site_id} 没有任何任务记录")
@@ -100,6 +121,11 @@ async def retry_failed_tasks(
                 logger.error(f"处理站点 {site_id} 的任务时出错: {str(e)}")
                 continue
         
+        # 4. 将所有重试任务一次性添加到队列
+        responses = await queue_manager.add_tasks(task_creates, db)
+        for response in responses:
+            logger.info(f"站点 {response.site_id} 的重试任务已添加到队列: {response.task_id}")
+        
         if not responses:
             logger.info("没有找到需要重试的失败/取消任务")
             return []
@@ -120,7 +146,7 @@ async def create_task(
     create_for_all_sites: bool = Query(False, description="是否为所有站点创建任务"),
     db: AsyncSession = Depends(get_db),
     site_manager: SiteManager = Depends(get_site_manager),
-    queue_manager: QueueManager = Depends(lambda: QueueManager())
+    queue_manager: QueueManager = Depends(get_queue_manager)
 ) -> List[TaskResponse]:
     """创建任务
     
@@ -141,7 +167,7 @@ async def create_task(
         - 单个站点创建失败不会影响其他站点的任务创建
     """
     try:
-        responses = []
+        task_creates = []
         
         if not site_id and not create_for_all_sites:
             raise HTTPException(
@@ -158,6 +184,10 @@ async def create_task(
             logger.info(f"正在为站点 {site_id} 创建任务")
             site_ids = [site_id]
             
+        # 整批任务共用同一创建时间和时间戳
+        current_time = datetime.now()
+        time_str = current_time.strftime('%Y%m%d-%H%M%S')
+            
         # 为每个站点创建任务
         for current_site_id in site_ids:
             try:
@@ -176,8 +206,7 @@ async def create_task(
                     continue
                     
                 # 2. 生成任务ID：{site_id}-YYYYMMDD-HHMMSS-4位uuid
-                current_time = datetime.now()
-                task_id = f"{current_site_id}-{current_time.strftime('%Y%m%d-%H%M%S')}-{str(uuid.uuid4())[:4]}"
+                task_id = f"{current_site_id}-{time_str}-{str(uuid.uuid4())[:4]}"
                 
                 # 3. 创建任务
                 task_create = TaskCreate(
@@ -188,20 +217,18 @@ async def create_task(
                     updated_at=current_time
                 )
                 
-                # 4. 将任务添加到队列
-                logger.debug(f"将任务添加到队列 - 任务ID: {task_id}")
-                response = await queue_manager.add_task(task_create, db)
-                
-                if response:
-                    responses.append(response)
-                    logger.info(f"站点 {current_site_id} 的任务 {task_id} 创建成功")
-                else:
-                    logger.error(f"站点 {current_site_id} 的任务创建失败")
+                task_creates.append(task_create)
                     
             except Exception as e:
                 logger.error(f"站点 {current_site_id} 的任务创建失败: {str(e)}")
                 continue
         
+        # 4. 将所有任务一次性添加到队列
+        logger.debug(f"将 {len(task_creates)} 个任务添加到队列")
+        responses = await queue_manager.add_tasks(task_creates, db)
+        for response in responses:
+            logger.info(f"站点 {response.site_id} 的任务 {response.task_id} 创建成功")
+        
         if not responses:
             if create_for_all_sites:
                 raise HTTPException(
@@ -226,12 +253,14 @@ async def create_task(
         )
 
 @router.get("/{task_id}", response_model=TaskResponse, summary="获取任务信息")
-async def get_task(
+def get_task(
     task_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_sync_db)
 ) -> TaskResponse:
     """
     获取指定任务的信息
+
+    只做单次主键查询，使用同步会话由线程池执行，不占用事件循环
     
     Args:
         task_id: 任务ID
@@ -246,18 +275,22 @@ async def get_task(
     try:
         logger.info(f"获取任务信息 - 任务ID: {task_id}")
         
-        # 查询任务
-        stmt = select(Task).where(Task.task_id == task_id)
-        result = await db.execute(stmt)
-        task = result.scalar_one_or_none()
+        # 按主键查询任务
+        task = db.get(Task, task_id)
         
         if not task:
             logger.error(f"任务不存在: {task_id}")
             raise HTTPException(status_code=404, detail=f"任务不存在: {task_id}")
             
         logger.debug(f"获取任务信息成功 - 任务ID: {task_id}")
-        return TaskResponse.from_orm(task)
+        # 直接由 pydantic-core 序列化为 JSON，跳过 FastAPI 对返回值的二次校验和编码
+        return Response(
+            content=TaskResponse.from_orm_trusted(task).model_dump_json(),
+            media_type="application/json"
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"获取任务信息失败: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"获取任务信息失败: {str(e)}")
@@ -266,38 +299,63 @@ async def get_task(
 async def list_tasks(
     site_id: Optional[str] = None,
     status: Optional[str] = None,
-    limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    limit: int = Query(10, ge=1, le=MAX_LIST_LIMIT, description="返回数量限制"),
+    db: AsyncSession = Depends(get_db),
+    process_manager: ProcessManager = Depends(get_process_manager)
 ) -> List[TaskResponse]:
     """
     获取任务列表，支持按站点和状态筛选
-    
+
+    进程仍存活的任务直接在查询中通过 CASE 表达式标记为 RUNNING，
+    结果按行映射返回，不构造 ORM 对象，响应体只序列化一次
+
     Args:
         site_id: 站点ID（可选）
         status: 任务状态（可选）
         limit: 返回数量限制
         db: 数据库会话
-        
+        process_manager: 进程管理器
+
     Returns:
         List[TaskResponse]: 任务列表
     """
     try:
         logger.info(f"获取任务列表 - 站点: {site_id}, 状态: {status}, 限制: {limit}")
-        
-        # 构建查询
-        query = select(Task)
+
+        running_task_ids = process_manager.get_running_task_ids()
+
+        # 进程仍存活的任务统一视为 RUNNING，过滤和返回都使用同一个状态表达式
+        status_column = Task.status
+        if running_task_ids:
+            status_column = case(
+                (Task.task_id.in_(running_task_ids), literal(TaskStatus.RUNNING, Task.status.type)),
+                else_=Task.status
+            )
+
+        # 过滤条件
+        filters = []
         if site_id:
-            query = query.where(Task.site_id == site_id)
+            filters.append(Task.site_id == site_id)
         if status:
-            query = query.where(Task.status == TaskStatus(status))
-        query = query.order_by(Task.created_at.desc()).limit(limit)
-        
+            filters.append(status_column == TaskStatus(status))
+
+        # 构建查询
+        columns = [c for c in Task.__table__.columns if c.key != "status"]
+        query = (
+            select(*columns, status_column.label("status"))
+            .where(*filters)
+            .order_by(Task.created_at.desc())
+            .limit(limit)
+        )
+
         # 执行查询
         result = await db.execute(query)
-        tasks = result.scalars().all()
-        
-        logger.debug(f"获取任务列表成功 - 共 {len(tasks)} 条记录")
-        return [TaskResponse.from_orm(task) for task in tasks]
+        rows = result.mappings().all()
+        tasks = [TaskResponse.from_orm_trusted(row) for row in rows]
+        body = _TASK_LIST_ADAPTER.dump_json(tasks)
+
+        logger.debug(f"获取任务列表成功 - 共 {len(rows)} 条记录")
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         logger.error(f"获取任务列表失败: {str(e)}", exc_info=True)
@@ -307,7 +365,7 @@ async def list_tasks(
 async def cancel_task(
     task_id: str,
     db: AsyncSession = Depends(get_db),
-    queue_manager: QueueManager = Depends(lambda: QueueManager()),
+    queue_manager: QueueManager = Depends(get_queue_manager),
     process_manager: ProcessManager = Depends(get_process_manager)
 ) -> dict:
     """
@@ -328,35 +386,46 @@ async def cancel_task(
     try:
         logger.info(f"取消任务请求 - 任务ID: {task_id}")
         
-        # 1. 查询任务
-        stmt = select(Task).where(Task.task_id == task_id)
-        result = await db.execute(stmt)
-        task = result.scalar_one_or_none()
+        # 1. 单条 UPDATE ... RETURNING 原子地将非终态任务标记为已取消
+        now = datetime.now()
+        stmt = (
+            update(Task)
+            .where(
+                Task.task_id == task_id,
+                Task.status.notin_([TaskStatus.SUCCESS, TaskStatus.FAILED, TaskStatus.CANCELLED])
+            )
+            .values(status=TaskStatus.CANCELLED, msg="任务已取消", completed_at=now, updated_at=now)
+            .returning(Task.task_id, Task.site_id)
+        )
+        row = (await db.execute(stmt)).first()
+        await db.commit()
         
-        if not task:
-            logger.error(f"任务不存在: {task_id}")
-            raise HTTPException(status_code=404, detail=f"任务不存在: {task_id}")
-            
-        # 2. 检查任务是否可以取消
-        if task.status in [TaskStatus.SUCCESS, TaskStatus.FAILED, TaskStatus.CANCELLED]:
+        # 2. 未更新任何行时，区分任务不存在与已是终态
+        if row is None:
+            task = await db.get(Task, task_id)
+            if not task:
+                logger.error(f"任务不存在: {task_id}")
+                raise HTTPException(status_code=404, detail=f"任务不存在: {task_id}")
             logger.warning(f"任务已完成或已取消，无法取消 - 任务ID: {task_id}, 状态: {task.status}")
             return {"message": f"任务已是终态: {task.status}"}
             
-        # 3. 如果任务正在运行，停止进程
-        if task.status == TaskStatus.RUNNING:
+        # 3. 如果任务进程仍在运行，停止进程
+        if task_id in process_manager.get_running_task_ids():
             logger.info(f"停止运行中的任务进程 - 任务ID: {task_id}")
-            if await process_manager.stop_task(task_id):
+            if await process_manager.cleanup_task(task_id):
                 logger.info(f"成功停止任务进程 - 任务ID: {task_id}")
             else:
                 logger.warning(f"停止任务进程失败或进程已不存在 - 任务ID: {task_id}")
         
-        # 4. 从队列中移除任务
+        # 4. 从内存队列中移除任务
         logger.debug(f"从队列中移除任务 - 任务ID: {task_id}")
-        await queue_manager.cancel_task(task_id, db)
+        await queue_manager.discard_task(task_id, row.site_id)
         
         logger.info(f"任务取消成功 - 任务ID: {task_id}")
         return {"message": "任务已取消"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"取消任务失败: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"取消任务失败: {str(e)}")
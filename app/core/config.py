@@ -16,6 +16,7 @@ class DatabaseSettings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800  # 30分钟
     DB_ECHO: bool = False
+    DB_QUERY_CACHE_SIZE: int = 1200  # 编译语句缓存条目数
 
     class Config:
         env_file = ".env"
@@ -1,13 +1,22 @@
+from typing import AsyncGenerator
+
+import orjson
 from core.config import database_settings
 from core.logger import get_logger
-from fastapi import Request
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
                                     create_async_engine)
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 _logger = get_logger(__name__, "database")
 
+
+def _json_serializer(obj) -> str:
+    """JSON列序列化，使用orjson代替标准库json"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # 创建带连接池的异步引擎
 engine = create_async_engine(
     database_settings.DATABASE_URL,
@@ -17,7 +26,10 @@ engine = create_async_engine(
     pool_timeout=database_settings.DB_POOL_TIMEOUT,
     pool_recycle=database_settings.DB_POOL_RECYCLE,
     echo=database_settings.DB_ECHO,
-    pool_pre_ping=True,
+    query_cache_size=database_settings.DB_QUERY_CACHE_SIZE,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    pool_pre_ping=False,  # 本地SQLite文件连接无需每次检出前探活
     connect_args={
         "timeout": 30,
         "check_same_thread": False
@@ -33,29 +45,83 @@ async_session = async_sessionmaker(
     autoflush=False
 )
 
-class Base(DeclarativeBase):
-    pass
+# 创建只读接口使用的同步引擎，由FastAPI线程池执行
+_database_url = make_url(database_settings.DATABASE_URL)
+_sync_database_url = _database_url.set(drivername=_database_url.get_backend_name())
+# 只有队列连接池接受连接池大小参数；SQLite 内存库等使用 SingletonThreadPool/StaticPool 时不传
+_sync_pool_kwargs = {}
+if issubclass(_sync_database_url.get_dialect().get_pool_class(_sync_database_url), QueuePool):
+    _sync_pool_kwargs = dict(
+        pool_size=database_settings.DB_POOL_SIZE,
+        max_overflow=database_settings.DB_MAX_OVERFLOW,
+        pool_timeout=database_settings.DB_POOL_TIMEOUT,
+        pool_recycle=database_settings.DB_POOL_RECYCLE,
+    )
+sync_engine = create_engine(
+    _sync_database_url,
+    **_sync_pool_kwargs,
+    echo=database_settings.DB_ECHO,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    pool_pre_ping=False,  # 本地SQLite文件连接无需每次检出前探活
+    connect_args={
+        "timeout": 30,
+        "check_same_thread": False
+    }
+)
+
+# 创建同步会话工厂
+sync_session = sessionmaker(
+    sync_engine,
+    class_=Session,
+    expire_on_commit=False,
+    autoflush=False
+)
+
+# SQLite连接初始化参数：WAL模式允许读写并发，synchronous=NORMAL 每次提交只需一次fsync
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
 
-# 数据库会话中间件
-async def db_session_middleware(request: Request, call_next):
-    """数据库会话中间件"""
-    session = async_session()
-    request.state.db = session
+def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+    """新建SQLite连接时设置PRAGMA"""
+    cursor = dbapi_conn.cursor()
     try:
-        response = await call_next(request)
-        await session.commit()
-        return response
-    except Exception as e:
-        await session.rollback()
-        _logger.error(f"Database middleware error: {str(e)}")
-        raise
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
     finally:
-        await session.close()
+        cursor.close()
+
+if _database_url.get_backend_name() == "sqlite":
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+
+class Base(DeclarativeBase):
+    pass
 
 # 用于API请求的数据库会话依赖
-async def get_db(request: Request) -> AsyncSession:
-    """从请求状态获取数据库会话"""
-    return request.state.db
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """获取数据库会话，仅在需要数据库的请求中创建
+
+    请求正常结束时提交，出现异常时回滚，退出上下文后连接立即归还连接池
+    """
+    async with async_session() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+# 用于同步只读API的数据库会话依赖
+def get_sync_db():
+    """获取同步数据库会话，请求结束后自动关闭"""
+    session = sync_session()
+    try:
+        yield session
+    finally:
+        session.close()
 
 # 用于初始化的数据库会话获取函数
 async def get_init_db() -> AsyncSession:
@@ -81,7 +147,6 @@ async def init_db():
             await conn.run_sync(Base.metadata.create_all)
         _logger.info("Database tables created successfully")
     except Exception as e:
-        _logger.error(f"Database initialization failed: {str(e)}")
         _logger.error(f"Database initialization failed: {str(e)}")
         raise
 
@@ -90,7 +155,7 @@ async def cleanup_db():
     """清理数据库连接"""
     try:
         await engine.dispose()
-        _logger.info("Database connections disposed successfully")
+        sync_engine.dispose()
         _logger.info("Database connections disposed successfully")
     except Exception as e:
         _logger.error(f"Failed to dispose database connections: {str(e)}")
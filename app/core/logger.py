@@ -1,13 +1,87 @@
 import os
 import sys
+import threading
+import weakref
+from functools import lru_cache
 from pathlib import Path
 
 from loguru import logger
 
 _logger = None
+# 控制台 sink，退出前由 flush_logger 写出其缓冲
+_console_sink = None
+# 存活的批量 sink，fork 后在子进程中统一重建
+_live_sinks = weakref.WeakSet()
+
+
+class BufferedStreamSink:
+    """批量写入的日志流 sink
+
+    日志先写入内存缓冲，达到条数上限、出现 WARNING 及以上级别、后台线程每隔 flush_interval
+    定时写出，或 sink 被移除时，才一次性写入底层流并 flush，减少逐条写入和 flush 的系统调用。
+    进程 fork 后在子进程中重建锁和写出线程，并丢弃从父进程复制来的未写出记录（由父进程负责写出）
+    """
+
+    def __init__(self, stream, max_records: int = 256, flush_interval: float = 0.05):
+        self._stream = stream
+        self._max_records = max_records
+        self._flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._start_flusher()
+        _live_sinks.add(self)
+
+    def write(self, message):
+        with self._lock:
+            self._buffer.append(message)
+            if (len(self._buffer) >= self._max_records
+                    or message.record["level"].no >= 30):
+                self._drain()
+
+    def flush(self):
+        with self._lock:
+            self._drain()
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            self._wakeup.set()
+            self._drain()
+
+    def _start_flusher(self):
+        self._wakeup = threading.Event()
+        threading.Thread(target=self._flush_loop, name="log-flush", daemon=True).start()
+
+    def _flush_loop(self):
+        # 定时写出，保证空闲时缓冲中的日志最多延迟 flush_interval
+        while not self._wakeup.wait(self._flush_interval):
+            with self._lock:
+                self._drain()
+
+    def _after_fork(self):
+        # fork 后子进程中只有调用线程存活，锁可能处于被持有状态
+        self._lock = threading.Lock()
+        self._buffer = []
+        if not self._stopped:
+            self._start_flusher()
+
+    def _drain(self):
+        if self._buffer:
+            self._stream.write("".join(self._buffer))
+            self._stream.flush()
+            self._buffer.clear()
+
+def _after_fork_in_child():
+    for sink in list(_live_sinks):
+        sink._after_fork()
+
+# fork 钩子只注册一次，通过弱引用集合找到仍存活的 sink
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
 def setup_logger(is_subprocess: bool = False):
-    global _logger
+    global _logger, _console_sink
     if _logger is not None:
         return _logger
         
@@ -18,6 +92,8 @@ def setup_logger(is_subprocess: bool = False):
     console_log_level = os.getenv('CONSOLE_LOG_LEVEL', log_level).upper()
     file_log_level = os.getenv('FILE_LOG_LEVEL', 'DEBUG').upper()
     error_log_level = os.getenv('ERROR_LOG_LEVEL', 'ERROR').upper()
+    # 异常诊断信息（变量值快照、完整回溯）开销较大，默认关闭，仅调试时开启
+    log_diagnose = os.getenv('LOG_DIAGNOSE', 'false').lower() == 'true'
     
     # 日志文件配置
     log_dir = Path(os.getenv('LOG_DIR', BASE_DIR / 'app'/'logs'))
@@ -32,10 +108,11 @@ def setup_logger(is_subprocess: bool = False):
     
     # 移除默认处理器
     logger.remove()
+    _console_sink = BufferedStreamSink(sys.stdout)
     if not is_subprocess:
-        # 添加控制台处理器（使用异步和队列）
+        # 添加控制台处理器（按批写出，不经过多进程队列）
         logger.add(
-            sys.stdout,
+            _console_sink,
             format="<green>{time:HH:mm:ss}</green> | "
                     "<level>{level: <8}</level> | "
                     "<blue>{extra[site_id]:<12}</blue> | "
@@ -43,9 +120,10 @@ def setup_logger(is_subprocess: bool = False):
                     "<level>{message}</level>",
             level=console_log_level,
             colorize=True,
-            enqueue=True,  # 启用队列模式
+            enqueue=False,  # 批量 sink 自带锁，无需队列
             catch=True,    # 捕获异常
-            diagnose=True  # 禁用诊断信息以提高性能
+            backtrace=log_diagnose,
+            diagnose=log_diagnose
         )
         
         # 确保日志目录存在
@@ -65,7 +143,8 @@ def setup_logger(is_subprocess: bool = False):
             encoding="utf-8",
             enqueue=True, # 启用队列模式
             catch=True,        # 捕获异常
-            diagnose=False,    # 禁用诊断信息以提高性能
+            backtrace=log_diagnose,
+            diagnose=log_diagnose,
             delay=True,        # 延迟创建文件直到第一次写入
             mode="a"          # 追加模式
         )
@@ -84,14 +163,15 @@ def setup_logger(is_subprocess: bool = False):
             encoding="utf-8",
             enqueue=True,      # 启用队列模式
             catch=True,        # 捕获异常
-            diagnose=False,    # 禁用诊断信息以提高性能
+            backtrace=True,    # 错误日志保留完整回溯
+            diagnose=log_diagnose,
             delay=True,        # 延迟创建文件直到第一次写入
             mode="a"          # 追加模式
         )
     else:
-        # 子进程只使用控制台输出，不写文件
+        # 子进程只使用控制台输出，不写文件，日志按批写出
         logger.add(
-            sys.stdout,
+            _console_sink,
             format="<green>{time:HH:mm:ss}</green> | "
                     "<level>{level: <8}</level> | "
                     "<blue>{extra[site_id]:<10}</blue> | "
@@ -101,7 +181,8 @@ def setup_logger(is_subprocess: bool = False):
             colorize=True,
             enqueue=False,
             catch=True,
-            diagnose=False
+            backtrace=log_diagnose,
+            diagnose=log_diagnose
         )
     # 记录日志配置信息
     _logger.trace("日志配置已加载")
@@ -114,7 +195,21 @@ def setup_logger(is_subprocess: bool = False):
     
     return _logger
 
+def flush_logger():
+    """写出控制台 sink 缓冲中尚未输出的日志
+
+    只处理控制台 sink，其余 sink 不受影响，之后的日志仍正常输出。
+    进程退出前调用：fork 出的子进程以 os._exit 或信号结束时不会触发 loguru 的清理
+    """
+    if _console_sink is not None:
+        _console_sink.flush()
+
+@lru_cache(maxsize=1024)
+def _bound_logger(name: str, site_id: str):
+    # 同一 (name, site_id) 复用同一个绑定实例，避免重复 bind 复制上下文
+    return _logger.bind(name=name, site_id=site_id)
+
 def get_logger(name: str, site_id: str = "Unknown", is_subprocess: bool = False):
     if _logger is None:
         setup_logger(is_subprocess)
-    return _logger.bind(name=name, site_id=site_id)
\ No newline at end of file
+    return _bound_logger(name, site_id)
\ No newline at end of file
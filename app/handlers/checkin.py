@@ -16,11 +16,12 @@ CheckInResult = Literal["not_set", "already", "success", "failed"]
 
 
 class CheckInHandler:
-    def __init__(self, site_setup: SiteSetup):
+    def __init__(self, site_setup: SiteSetup, logger=None):
         self.site_setup = site_setup
         self.settings_manager = SettingManager.get_instance()
         # setup_logger()
-        self.logger = get_logger(name=__name__, site_id=self.site_setup.site_id)
+        # 优先复用调用方已绑定的日志器
+        self.logger = logger or get_logger(name=__name__, site_id=self.site_setup.site_id)
         self.logger.debug(f"初始化CheckInHandler - 站点ID: {self.site_setup.site_id}")
 
     async def perform_checkin(self, tab: Chromium) -> CheckInResult:
@@ -18,12 +18,13 @@ from schemas.sitesetup import SiteSetup
 from services.managers.setting_manager import SettingManager
 
 class LoginHandler:
-    def __init__(self, site_setup: SiteSetup):
+    def __init__(self, site_setup: SiteSetup, logger=None):
         self.site_setup : SiteSetup = site_setup
         self.login_config : LoginConfig = self.site_setup.site_config.login_config
         self.settings_manager = SettingManager.get_instance()
         # setup_logger()
-        self.logger = get_logger(name=__name__, site_id=site_setup.site_id)
+        # 优先复用调用方已绑定的日志器
+        self.logger = logger or get_logger(name=__name__, site_id=site_setup.site_id)
         self.logger.debug(f"初始化LoginHandler - 站点ID: {site_setup.site_id}")
         self.captcha_service = CaptchaService()
 
@@ -88,7 +89,11 @@ class LoginHandler:
                 else:
                     self.logger.error(f"登录表单未找到 - 选择器: {self.login_config.form_selector}")
                     raise Exception("登录表单未找到")
-            self.logger.debug(f"登录表单已找到 - 元素ID: {form.attr('id')}, 类名: {form.attr('class')}")
+            # 元素属性需要与浏览器通信，仅在输出 DEBUG 日志时才读取
+            self.logger.opt(lazy=True).debug(
+                "登录表单已找到 - 元素ID: {}, 类名: {}",
+                lambda: form.attr('id'), lambda: form.attr('class')
+            )
 
             # 填充表单字段
             self.logger.info("开始填充表单字段")
@@ -117,7 +122,7 @@ class LoginHandler:
                     sleep(0.5)
                     input_ele = tab.ele(field_config.selector)
                     if input_ele:
-                        self.logger.debug(f"  - 找到输入元素 - ID: {input_ele.attr('id')}")
+                        self.logger.opt(lazy=True).debug("  - 找到输入元素 - ID: {}", lambda: input_ele.attr('id'))
                         
                         # 根据字段类型处理输入
                         if field_config.type == "password":
@@ -162,7 +167,7 @@ class LoginHandler:
                 submit_btn = tab.ele(submit_config.selector)
 
             if submit_btn:
-                self.logger.debug(f"点击登录按钮: {submit_btn.text}")
+                self.logger.opt(lazy=True).debug("点击登录按钮: {}", lambda: submit_btn.text)
                 submit_btn.click()
                 self.logger.trace("已点击登录按钮")
             else:
@@ -260,7 +265,7 @@ class LoginHandler:
                 self.logger.error(f"验证码输入框未找到 - 选择器: {input_selector}")
                 raise Exception("验证码输入框未找到")
             
-            self.logger.debug(f"找到验证码输入框 - ID: {captcha_input.attr('id')}")
+            self.logger.opt(lazy=True).debug("找到验证码输入框 - ID: {}", lambda: captcha_input.attr('id'))
             captcha_input.input(captcha_text)
             self.logger.debug("验证码已填充到输入框")
 
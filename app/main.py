@@ -5,14 +5,15 @@ import uvicorn
 from api.v1 import crawler_configs, credentials, queue
 from api.v1 import settings as settings_api
 from api.v1 import site_configs, statistics, tasks
-from core.database import (cleanup_db, db_session_middleware, get_db,
+from core.database import (cleanup_db, get_db,
                            get_init_db, init_db)
-from core.logger import get_logger, setup_logger
+from core.logger import get_logger, setup_logger, flush_logger
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from services.crawler.task_config import BaseTaskConfig
-from services.managers.process_manager import ProcessManager
-from services.managers.queue_manager import QueueManager
+from services.managers.process_manager import process_manager
+from services.managers.queue_manager import queue_manager
 from services.managers.result_manager import ResultManager
 from services.managers.setting_manager import SettingManager
 from services.managers.site_manager import SiteManager
@@ -20,10 +21,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 setup_logger()
 _logger = get_logger(name=__name__, site_id="Main")
+_health_logger = get_logger(name=__name__, site_id="HealthCheck")
 
 # 全局管理器实例
-process_manager = ProcessManager()
-queue_manager = QueueManager()
 site_manager = SiteManager()
 setting_manager = SettingManager()
 result_manager = ResultManager()
@@ -167,15 +167,16 @@ async def lifespan(app: FastAPI):
             _logger.info("Cleanup completed successfully")
             
         _logger.info("Application shutdown complete")
+        # 写出控制台缓冲中剩余的日志
+        flush_logger()
 
 app = FastAPI(
     title="PtLinker API",
     description="PT站点爬虫管理API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # 使用orjson序列化响应
 )
-# 添加数据库会话中间件
-app.middleware("http")(db_session_middleware)
 # 配置CORS
 app.add_middleware(
     CORSMiddleware,
@@ -198,8 +199,7 @@ app.include_router(settings_api.router, prefix="/api/v1", tags=["settings"])
 @app.get("/health")
 async def health_check():
     """健康检查端点"""
-    logger_ctx = get_logger(name=__name__, site_id="HealthCheck")
-    logger_ctx.debug("Health check requested")
+    _health_logger.debug("Health check requested")
     return {"status": "ok"}
 
 if __name__ == "__main__":
@@ -1 +1,21 @@
- 
\ No newline at end of file
+"""Add env config tables
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-01-10 16:15:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # 该版本未包含任何迁移操作，仅保持版本链连续
+    pass
+
+def downgrade():
+    pass
@@ -1,7 +1,7 @@
 """rename_enabled_to_enable_manual_cookies
 
-Revision ID: xxxxxxxxxxxx
-Revises: previous_revision_id
+Revision ID: 003
+Revises: 002
 Create Date: 2024-xx-xx xx:xx:xx.xxx
 
 """
@@ -9,8 +9,8 @@ import sqlalchemy as sa
 from alembic import op
 
 # revision identifiers, used by Alembic.
-revision = 'xxxxxxxxxxxx'
-down_revision = 'previous_revision_id'
+revision = '003'
+down_revision = '002'
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,27 @@
+"""Add task composite indexes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 10:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # 用带 created_at 的复合索引替换原有前缀索引
+    op.create_index('ix_task_status_created', 'tasks', ['status', 'created_at'])
+    op.create_index('ix_task_site_status_created', 'tasks', ['site_id', 'status', 'created_at'])
+    op.drop_index('ix_task_status', table_name='tasks')
+    op.drop_index('ix_task_crawler', table_name='tasks')
+
+def downgrade():
+    # 恢复原有索引
+    op.create_index('ix_task_crawler', 'tasks', ['site_id', 'status'])
+    op.create_index('ix_task_status', 'tasks', ['status'])
+    op.drop_index('ix_task_site_status_created', table_name='tasks')
+    op.drop_index('ix_task_status_created', table_name='tasks')
@@ -0,0 +1,24 @@
+"""Add check interval settings
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # 添加任务进程和队列的定期检查间隔配置
+    op.add_column('settings', sa.Column('task_check_interval', sa.Float(), nullable=True, comment='任务进程检查间隔（秒）'))
+    op.add_column('settings', sa.Column('queue_check_interval', sa.Float(), nullable=True, comment='队列检查间隔（秒）'))
+
+def downgrade():
+    # 删除检查间隔配置
+    op.drop_column('settings', 'queue_check_interval')
+    op.drop_column('settings', 'task_check_interval')
@@ -19,8 +19,8 @@ class TaskStatus(PyEnum):
     CANCELLED = "cancelled" # 已取消
 
 class TimestampMixin:
-    created_at = Column(DateTime, default=datetime.now(), nullable=False)
-    updated_at = Column(DateTime, default=datetime.now(), onupdate=datetime.now(), nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
     
 class Crawler(Base):
     __tablename__ = "crawlers"
@@ -135,8 +135,9 @@ class Task(Base, TimestampMixin):
 
     # 索引和约束
     __table_args__ = (
-        Index('ix_task_status', 'status'),
-        Index('ix_task_crawler', 'site_id', 'status'),
+        # 队列按状态取最早任务、重试按站点取最新任务，均需 created_at 参与排序
+        Index('ix_task_status_created', 'status', 'created_at'),
+        Index('ix_task_site_status_created', 'site_id', 'status', 'created_at'),
         Index('ix_task_dates', 'created_at', 'completed_at'),
     )
 
@@ -10,8 +10,8 @@ class Settings(Base):
     __tablename__ = "settings"
 
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime, default=datetime.now(), nullable=False)
-    updated_at = Column(DateTime, default=datetime.now(), onupdate=datetime.now(), nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
     
     # 核心配置
     crawler_config_path = Column(String(500), default="services/sites/implementations", nullable=False, comment="爬虫配置路径")
@@ -23,6 +23,8 @@ class Settings(Base):
     crawler_max_concurrency = Column(Integer, default=8, comment="爬虫最大并发数")
     fresh_login = Column(Boolean, default=False, nullable=False, comment="是否强制重新登录")
     login_max_retry = Column(Integer, default=3, nullable=False, comment="登录最大重试次数")
+    task_check_interval = Column(Float, default=15, comment="任务进程检查间隔（秒）")
+    queue_check_interval = Column(Float, default=30, comment="队列检查间隔（秒）")
     
     # 验证码配置
     captcha_default_method = Column(String(50), default="api", comment="验证码处理方法")
@@ -14,6 +14,8 @@ class SettingsBase(BaseModel):
     crawler_max_concurrency: int = Field(default=8, description="爬虫最大并发数")
     fresh_login: bool = Field(default=False, description="是否强制重新登录")
     login_max_retry: int = Field(default=3, description="登录最大重试次数")
+    task_check_interval: float = Field(default=15.0, description="任务进程检查间隔（秒）")
+    queue_check_interval: float = Field(default=30.0, description="队列检查间隔（秒）")
     
     # 验证码配置
     captcha_default_method: str = Field(default="api", description="验证码处理方法")
@@ -86,6 +88,8 @@ class SettingsUpdate(BaseModel):
     crawler_max_concurrency: Optional[int] = None
     fresh_login: Optional[bool] = None
     login_max_retry_count: Optional[int] = None
+    task_check_interval: Optional[float] = None
+    queue_check_interval: Optional[float] = None
     captcha_default_method: Optional[str] = None
     captcha_skip_sites: Optional[str] = None
     captcha_api_key: Optional[str] = None
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Any, Dict, Optional
-import json
+
+import orjson
 
 from pydantic import BaseModel, Field
 
@@ -50,7 +51,7 @@ class SiteSetup(BaseModel):
             for field in ['login_config', 'extract_rules', 'checkin_config']:
                 if site_config_dict.get(field):
                     try:
-                        site_config_dict[field] = json.loads(site_config_dict[field])
+                        site_config_dict[field] = orjson.loads(site_config_dict[field])
                     except:
                         site_config_dict[field] = {}
 
@@ -62,7 +63,7 @@ class SiteSetup(BaseModel):
             for field in ['cookies', 'local_storage', 'session_storage']:
                 if browser_state_dict.get(field):
                     try:
-                        browser_state_dict[field] = json.loads(browser_state_dict[field])
+                        browser_state_dict[field] = orjson.loads(browser_state_dict[field])
                     except:
                         browser_state_dict[field] = {}
 
@@ -100,12 +101,12 @@ class SiteSetup(BaseModel):
     
     def to_json(self) -> str:
         """转换为JSON字符串"""
-        return json.dumps(self.to_serializable_dict())
+        return orjson.dumps(self.to_serializable_dict()).decode()
     
     @classmethod
     def from_json(cls, json_str: str) -> "SiteSetup":
         """从JSON字符串创建实例"""
-        data = json.loads(json_str)
+        data = orjson.loads(json_str)
         return cls.from_serializable_dict(data)
     
     @classmethod
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 from pydantic import BaseModel, Field, computed_field
 from schemas.result import ResultResponse
@@ -17,6 +17,10 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# 状态值到响应枚举的映射，用于快速转换数据库中的状态
+_STATUS_BY_VALUE = {status.value: status for status in TaskStatus}
+
+
 class TaskBase(BaseModel):
     """任务基础模型"""
     task_id: str = Field(..., description="任务ID")
@@ -32,10 +36,12 @@ class TaskBase(BaseModel):
     # result: Optional[ResultResponse] = Field(None, description="任务结果")
 
     class Config:
+        # datetime 由 pydantic-core 原生序列化为 ISO 8601，无需逐字段调用 Python 编码函数
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
+
+
+# 从数据库行构造响应时读取的字段
+_TASK_ROW_FIELDS = tuple(TaskBase.model_fields)
 
 
 class TaskCreate(TaskBase):
@@ -65,6 +71,26 @@ class TaskResponse(TaskBase):
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
 
+    @classmethod
+    def from_orm_trusted(cls, obj: Any) -> 'TaskResponse':
+        """从可信的数据库对象或行映射构造响应，跳过字段校验
+
+        数据已由数据库列类型约束，只需把状态转换为响应使用的枚举
+
+        Args:
+            obj: Task ORM 对象或包含任务列的行映射
+
+        Returns:
+            TaskResponse: 任务响应
+        """
+        if isinstance(obj, Mapping):
+            data = {name: obj[name] for name in _TASK_ROW_FIELDS if name in obj}
+        else:
+            data = {name: getattr(obj, name) for name in _TASK_ROW_FIELDS}
+        status = data["status"]
+        data["status"] = _STATUS_BY_VALUE[getattr(status, "value", status)]
+        return cls.model_construct(**data)
+
     # @computed_field
     # @property
     # def duration(self) -> Optional[float]:
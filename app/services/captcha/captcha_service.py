@@ -10,6 +10,9 @@ from services.managers.setting_manager import SettingManager
 from .handlers.api_handler import APIHandler
 from .handlers.ocr_handler import OCRHandler
 
+# 进程内共享的 HTTP 会话，登录重试时复用到同一站点的连接
+_http_session = requests.Session()
+
 
 class CaptchaService:
     def __init__(self):
@@ -136,7 +139,7 @@ class CaptchaService:
             bytes: 图片的二进制数据
         """
         try:
-            response = requests.get(url, timeout=10)
+            response = _http_session.get(url, timeout=10)
             response.raise_for_status()
             return response.content
         except Exception as e:
@@ -25,6 +25,33 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 CheckInResult = Literal["not_set", "already", "success", "failed"]
 
+# 数据清洗使用的正则，模块加载时编译一次
+_SIZE_RE = re.compile(r'([\d.]+)\s*([TGMK]B|B)?', re.IGNORECASE)
+_DATETIME_RE = re.compile(r'(\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2})')
+_NUMBER_RE = re.compile(r'([\d.]+)')
+_INTEGER_RE = re.compile(r'(\d+)')
+
+# 浏览器启动参数，关闭与爬取无关的后台组件以缩短每个任务的浏览器启动时间
+_BROWSER_ARGUMENTS = (
+    "--no-first-run",
+    "--force-color-profile=srgb",
+    "--metrics-recording-only",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--export-tagged-pdf",
+    "--no-default-browser-check",
+    "--disable-background-mode",
+    "--enable-features=NetworkService,NetworkServiceInProcess,LoadCryptoTokenExtension,PermuteTLSExtensions",
+    "--disable-features=FlashDeprecationWarning,EnablePasswordsAccountStorage",
+    "--deny-permission-prompts",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+)
+
 class BaseCrawler(ABC):
     def __init__(self, site_setup: SiteSetup, task_id: str):
         # 1. 基础配置初始化
@@ -48,8 +75,8 @@ class BaseCrawler(ABC):
         self.task_storage_path.mkdir(parents=True, exist_ok=True)
         
         # 5. 处理器初始化
-        self.login_handler = LoginHandler(self.site_setup)
-        self.checkin_handler = CheckInHandler(self.site_setup)
+        self.login_handler = LoginHandler(self.site_setup, logger=self.logger)
+        self.checkin_handler = CheckInHandler(self.site_setup, logger=self.logger)
         
         # 6. 结果管理器
         self.result_manager = ResultManager()
@@ -215,24 +242,8 @@ class BaseCrawler(ABC):
             # 阻止"Chrome未正确关闭"的提示气泡
             options.set_argument('--hide-crash-restore-bubble')
 
-            # 添加其他启动参数
-            arguments = [
-                "--no-first-run",
-                "--force-color-profile=srgb",
-                "--metrics-recording-only",
-                "--password-store=basic",
-                "--use-mock-keychain",
-                "--export-tagged-pdf",
-                "--no-default-browser-check",
-                "--disable-background-mode",
-                "--enable-features=NetworkService,NetworkServiceInProcess,LoadCryptoTokenExtension,PermuteTLSExtensions",
-                "--disable-features=FlashDeprecationWarning,EnablePasswordsAccountStorage",
-                "--deny-permission-prompts",
-                "--disable-gpu"
-            ]
-            
             # 添加所有参数
-            for arg in arguments:
+            for arg in _BROWSER_ARGUMENTS:
                 options.set_argument(arg)
             
             # 创建浏览器实例
@@ -464,7 +475,7 @@ class BaseCrawler(ABC):
             size_str = size_str.strip().upper()
             
             # 使用正则表达式匹配数字和单位
-            size_match = re.search(r'([\d.]+)\s*([TGMK]B|B)?', size_str, re.IGNORECASE)
+            size_match = _SIZE_RE.search(size_str)
             if not size_match:
                 self.logger.warning(f"无法解析的数据量格式: {size_str}")
                 return 0.0
@@ -508,12 +519,12 @@ class BaseCrawler(ABC):
             
             # 清洗时间格式
             if 'join_time' in data:
-                join_time = re.search(r'(\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2})', data['join_time'])
+                join_time = _DATETIME_RE.search(data['join_time'])
                 if join_time:
                     cleaned_data['join_time'] = datetime.strptime(join_time.group(1), '%Y-%m-%d %H:%M:%S').isoformat()
             
             if 'last_active' in data:
-                last_active = re.search(r'(\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2})', data['last_active'])
+                last_active = _DATETIME_RE.search(data['last_active'])
                 if last_active:
                     cleaned_data['last_active'] = datetime.strptime(last_active.group(1), '%Y-%m-%d %H:%M:%S').isoformat()
             
@@ -528,7 +539,7 @@ class BaseCrawler(ABC):
             
             # 清洗分享率
             if 'ratio' in data:
-                ratio_match = re.search(r'([\d.]+)', data['ratio'])
+                ratio_match = _NUMBER_RE.search(data['ratio'])
                 if ratio_match:
                     cleaned_data['ratio'] = float(ratio_match.group(1))
             elif cleaned_data.get('upload', None) and cleaned_data.get('download', None):
@@ -537,25 +548,25 @@ class BaseCrawler(ABC):
             # 清洗魔力值
             if 'bonus' in data:
                 bonus_str = data['bonus'].replace(',', '')
-                bonus_match = re.search(r'([\d.]+)', bonus_str)
+                bonus_match = _NUMBER_RE.search(bonus_str)
                 if bonus_match:
                     cleaned_data['bonus'] = float(bonus_match.group(1))
             
             # 清洗做种积分
             if 'seeding_score' in data:
                 score_str = data['seeding_score'].replace(',', '')
-                score_match = re.search(r'([\d.]+)', score_str)
+                score_match = _NUMBER_RE.search(score_str)
                 if score_match:
                     cleaned_data['seeding_score'] = float(score_match.group(1))
             
             # 清洗HR数据
             if 'hr_count' in data:
-                hr_match = re.search(r'(\d+)', data['hr_count'])
+                hr_match = _INTEGER_RE.search(data['hr_count'])
                 if hr_match:
                     cleaned_data['hr_count'] = int(hr_match.group(1))
             
             if 'bonus_per_hour' in data:
-                bph_match = re.search(r'([\d.]+)', data['bonus_per_hour'])
+                bph_match = _NUMBER_RE.search(data['bonus_per_hour'])
                 if bph_match:
                     cleaned_data['bonus_per_hour'] = float(bph_match.group(1))
             
@@ -1,5 +1,5 @@
 import re
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 from urllib.parse import urljoin
 
 from DrissionPage import Chromium
@@ -10,6 +10,21 @@ from utils.url import convert_url
 
 from .base_crawler import BaseCrawler
 
+# 按 rule.location 预先构建的元素定位分派表
+_LOCATION_RESOLVERS = {
+    'next': lambda element, rule: element.next(),
+    'parent': lambda element, rule: element.parent(),
+    'next-child': lambda element, rule: element.next().child(rule.second_selector),
+    'parent-child': lambda element, rule: element.parent().child(rule.second_selector),
+    'east': lambda element, rule: element.east(rule.second_selector),
+}
+# 需要 second_selector 才能生效的定位方式
+_NEEDS_SECOND_SELECTOR = frozenset({'next-child', 'parent-child', 'east'})
+
+# 预编译的提取正则
+_UID_RE = re.compile(r'id=(\d+)')
+_UCOIN_RE = re.compile(r'UCoin(\d+\.\d+)')
+
 
 class SiteCrawler(BaseCrawler):
     """统一的站点爬虫类"""
@@ -112,7 +127,7 @@ class SiteCrawler(BaseCrawler):
         
         # 提取用户ID（如果需要）
         uid = None
-        uid_match = re.search(r'id=(\d+)', profile_url)
+        uid_match = _UID_RE.search(profile_url)
         if uid_match:
             uid = uid_match.group(1)
             self.logger.debug(f"提取到用户ID: {uid}")
@@ -157,52 +172,51 @@ class SiteCrawler(BaseCrawler):
             
         # 按规则分组，先处理不需要预处理的规则
         normal_rules = []
-        pre_action_rules = []
+        # 需要预处理的规则按目标页面分组，每个页面只访问一次
+        page_rules: Dict[str, List[WebElement]] = {}
         rule: WebElement
         for rule in extract_rules.rules:
-            if rule.need_pre_action:
-                pre_action_rules.append(rule)
-            else:
+            if not rule.need_pre_action:
                 normal_rules.append(rule)
+            elif rule.pre_action_type == 'goto' and rule.page_url:
+                page_rules.setdefault(rule.page_url, []).append(rule)
                 
         # 先处理普通规则
         for rule in normal_rules:
-            try:
-                value = await self._extract_element_value(tab, rule)
-                if value is not None:
-                    data[rule.name] = value
-                elif rule.required:
-                    raise ValueError(f"必需的字段 {rule.name} 未能提取到值")
-            except Exception as e:
-                self.logger.error(f"提取 {rule.name} 时出错: {str(e)}")
-                if rule.required:
-                    raise
+            await self._extract_rule_into(tab, rule, data)
                     
         # 处理需要预处理的规则
-        for rule in pre_action_rules:
-            try:
-                original_url = tab.url
-                # 如果规则指定了页面URL，先访问该页面
-                if rule.pre_action_type == 'goto' and rule.page_url:
-                    full_url = convert_url(self.site_setup.site_config.site_url, rule.page_url, uid=self.uid)
+        if page_rules:
+            original_url = tab.url
+            for page_url, rules in page_rules.items():
+                try:
+                    full_url = convert_url(self.site_setup.site_config.site_url, page_url, uid=self.uid)
                     self.logger.debug(f"访问页面: {full_url}")
                     tab.get(full_url)
-                
-                    # 提取数据
-                    value = await self._extract_element_value(tab, rule)
-                    if value is not None:
-                        data[rule.name] = value
-                    elif rule.required:
-                        raise ValueError(f"必需的字段 {rule.name} 未能提取到值")
-                    # 返回原页面
-                    tab.get(original_url)
-
-            except Exception as e:
-                self.logger.error(f"提取 {rule.name} 时出错: {str(e)}")
-                if rule.required:
-                    raise
+                except Exception as e:
+                    self.logger.error(f"访问页面 {page_url} 时出错: {str(e)}")
+                    if any(rule.required for rule in rules):
+                        raise
+                    continue
+                for rule in rules:
+                    await self._extract_rule_into(tab, rule, data)
+            # 返回原页面
+            tab.get(original_url)
             
         return data
+
+    async def _extract_rule_into(self, tab: Chromium, rule: WebElement, data: Dict[str, Any]) -> None:
+        """按单条规则提取数据并写入 data，必需字段缺失时抛出异常"""
+        try:
+            value = await self._extract_element_value(tab, rule)
+            if value is not None:
+                data[rule.name] = value
+            elif rule.required:
+                raise ValueError(f"必需的字段 {rule.name} 未能提取到值")
+        except Exception as e:
+            self.logger.error(f"提取 {rule.name} 时出错: {str(e)}")
+            if rule.required:
+                raise
         
     async def _extract_element_value(self, tab: Chromium, rule: WebElement) -> Optional[str]:
         """提取元素值"""
@@ -214,16 +228,9 @@ class SiteCrawler(BaseCrawler):
                     self.logger.warning(f"未找到基础定位元素: {rule.selector}")
                     return None
                     
-                if rule.location == 'next':
-                    element = base_element.next()
-                elif rule.location == 'parent':
-                    element = base_element.parent()
-                elif rule.location == 'next-child' and rule.second_selector:
-                    element = base_element.next().child(rule.second_selector)
-                elif rule.location == 'parent-child' and rule.second_selector:
-                    element = base_element.parent().child(rule.second_selector)
-                elif rule.location == 'east' and rule.second_selector:
-                    element = base_element.east(rule.second_selector)
+                resolver = _LOCATION_RESOLVERS.get(rule.location)
+                if resolver and (rule.location not in _NEEDS_SECOND_SELECTOR or rule.second_selector):
+                    element = resolver(base_element, rule)
                 else:
                     element = base_element
             else:
@@ -241,8 +248,9 @@ class SiteCrawler(BaseCrawler):
                 value = element.attr(rule.attribute)
             elif rule.type == "by_day":
                 # 用于u2临时提取UCoin值
-                self.logger.debug(f"提取 {rule.name} 时，元素文本: {element.texts()[-1]}")
-                match = re.search(r'UCoin(\d+\.\d+)', element.texts()[0])
+                texts = element.texts()
+                self.logger.debug(f"提取 {rule.name} 时，元素文本: {texts[-1]}")
+                match = _UCOIN_RE.search(texts[0])
                 if match:
                     result = match.group(1)
                     value = str(float(result)/24)
@@ -96,7 +96,6 @@ class BrowserStateManager:
                     
                 # 提交所有更改
                 await self.session.commit()
-                await self.session.refresh(db_state)
                 
                 self.logger.info(f"浏览器状态已保存: {site_id}")
                 return db_state
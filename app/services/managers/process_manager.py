@@ -1,6 +1,9 @@
 import asyncio
+import contextlib
 import os
+import signal
 import sys
+import time
 import traceback
 from datetime import datetime
 from multiprocessing import Process
@@ -8,7 +11,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from core.database import AsyncSession
-from core.logger import get_logger, setup_logger
+from core.logger import get_logger, setup_logger, flush_logger
 from models.models import Task, TaskStatus
 from schemas.task import TaskCreate, TaskResponse, TaskUpdate
 from services.crawler.site_crawler import SiteCrawler
@@ -19,6 +22,18 @@ from services.managers.site_manager import SiteManager
 from services.managers.task_status_manager import task_status_manager
 from sqlalchemy import select
 
+try:
+    # uvicorn[standard] 在非 Windows 平台会安装 uvloop
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# 关闭时同时回收的进程数量上限
+_CLEANUP_CONCURRENCY = 8
+
+# 任务日志目录，导入时解析一次
+_TASK_LOG_DIR = str(Path(__file__).parent.parent.parent / 'logs' / 'tasks')
+
 
 class CrawlerProcess(Process):
     """爬虫进程类"""
@@ -27,6 +42,7 @@ class CrawlerProcess(Process):
         self.site_id = site_id
         self.task_id = task_id
         self.log_dir = log_dir
+        self.start_time: Optional[float] = None  # 父进程中记录的启动时刻（time.monotonic()）
         
     def run(self):
         """进程运行入口"""
@@ -49,6 +65,10 @@ class CrawlerProcess(Process):
                 
                 # 初始化数据库连接
                 from core import database
+                # fork 出的子进程继承了父进程连接池中的连接，丢弃这些连接（不关闭，
+                # 以免影响父进程），子进程按需建立自己的连接
+                database.engine.sync_engine.dispose(close=False)
+                database.sync_engine.dispose(close=False)
                 db = await database.get_init_db()
                 
                 # 更新任务状态为 PENDING
@@ -70,7 +90,11 @@ class CrawlerProcess(Process):
                 # 3. 初始化 queue manager
                 logger.debug("初始化 queue manager")
                 from services.managers.queue_manager import queue_manager
-                await queue_manager.initialize(max_concurrency=await SettingManager.get_instance().get_setting("crawler_max_concurrency"))
+                # 子进程只需要队列管理器的状态更新能力，定期检查由主进程负责
+                await queue_manager.initialize(
+                    max_concurrency=await SettingManager.get_instance().get_setting("crawler_max_concurrency"),
+                    start_periodic_check=False
+                )
                 
                 # 4. 初始化 result manager
                 logger.debug("初始化 result manager")
@@ -125,8 +149,36 @@ class CrawlerProcess(Process):
                 if db:
                     await db.close()
         
-        # 运行异步任务
-        asyncio.run(_run())
+        # 被 terminate() 时只抛出 SystemExit 结束事件循环，信号处理函数中不获取任何锁
+        # （中断点可能正持有日志 sink 的锁），缓冲日志由下方 finally 写出
+        terminated = False
+        
+        def _on_sigterm(signum, frame):
+            nonlocal terminated
+            terminated = True
+            signal.signal(signum, signal.SIG_IGN)
+            raise SystemExit(128 + signum)
+        
+        signal.signal(signal.SIGTERM, _on_sigterm)
+        
+        # 运行异步任务，可用时使用 uvloop 事件循环
+        try:
+            if hasattr(asyncio, "Runner"):
+                loop_factory = uvloop.new_event_loop if uvloop is not None else None
+                with asyncio.Runner(loop_factory=loop_factory) as runner:
+                    runner.run(_run())
+            else:
+                # Python 3.10 没有 asyncio.Runner，通过事件循环策略启用 uvloop
+                if uvloop is not None:
+                    uvloop.install()
+                asyncio.run(_run())
+        finally:
+            # 子进程退出时不会执行 atexit，主动写出缓冲中的日志
+            flush_logger()
+            if terminated:
+                # 日志写出后按默认方式重新投递信号，退出码保持为 -SIGTERM
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                os.kill(os.getpid(), signal.SIGTERM)
         
     async def _update_task_status(self, db: AsyncSession, status: TaskStatus, 
                                 msg: Optional[str] = None,
@@ -147,24 +199,33 @@ class CrawlerProcess(Process):
 class ProcessManager:
     """进程管理器"""
     def __init__(self):
-        self._processes: Dict[str, CrawlerProcess] = {}  # task_id -> process
-        self._status: Dict[str, Dict] = {}  # task_id -> status
+        self._processes: Dict[str, CrawlerProcess] = {}  # task_id -> process，进程对象同时保存站点和启动时间
         self._running_sites: Dict[str, str] = {}  # site_id -> task_id
         self._lock = asyncio.Lock()
         self._queue_manager = None
         self._db = None
         self._task_timeout = 240  # 默认超时时间（秒）
         self._max_concurrency = 1  # 默认最大并发数
+        self._check_interval = 15.0  # 任务定期检查间隔（秒）
+        self._exit_event = asyncio.Event()  # 任一子进程退出时置位，唤醒周期检查
+        self._check_task: Optional[asyncio.Task] = None  # 定期检查任务，关闭时取消
         self.logger = get_logger(name=__name__, site_id="ProcessMgr")
         
     async def initialize(self, queue_manager, db: AsyncSession) -> None:
-        """初始化进程管理器"""
+        """初始化进程管理器
+        
+        只在主进程中调用；爬虫子进程不使用进程管理器。锁、事件和定期检查任务在这里按当前事件循环重建
+        """
+        self._lock = asyncio.Lock()
+        self._exit_event = asyncio.Event()
+        self._check_task = None
         self._queue_manager = queue_manager
         self._db = db
         
         # 获取最大并发数设置
         from services.managers.setting_manager import SettingManager
         self._max_concurrency = await SettingManager.get_instance().get_setting("crawler_max_concurrency")
+        self._check_interval = float(await SettingManager.get_instance().get_setting("task_check_interval") or 15)
         self.logger.info(f"Process manager initialized with max concurrency: {self._max_concurrency}")
         
         # 创建定期检查任务
@@ -172,42 +233,56 @@ class ProcessManager:
             while True:
                 try:
                     await self.check_all_tasks()
-                    self.logger.info("周期检查任务状态")
+                    self.logger.debug("周期检查任务状态")
                 except Exception as e:
                     self.logger.error(f"周期检查任务失败: {str(e)}")
                     self.logger.debug("错误详情:", exc_info=True)
-                await asyncio.sleep(15)  # 每5秒检查一次
+                # 最多等待一个检查间隔；子进程退出时立即唤醒，不必等到下一轮轮询
+                try:
+                    await asyncio.wait_for(self._exit_event.wait(), timeout=self._check_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._exit_event.clear()
                 
-        # 启动定期检查任务
-        asyncio.create_task(periodic_check())
+        # 启动定期检查任务，保留引用以便关闭时取消
+        self._check_task = asyncio.create_task(periodic_check())
         
-    async def check_task_status(self, task_id: str) -> Optional[Dict]:
+    async def check_task_status(self, task_id: str, now: Optional[float] = None) -> Optional[Dict]:
         """检查任务状态
         
         Args:
             task_id: 任务ID
+            now: 计算运行时间使用的 time.monotonic() 读数，批量检查时由调用方统一传入
             
         Returns:
             Optional[Dict]: 任务状态信息，包含 is_alive、exit_code 和 running_time
         """
-        if task_id not in self._processes:
+        process = self._processes.get(task_id)
+        if process is None:
             return None
-            
-        process = self._processes[task_id]
-        status = self._status[task_id].copy()
         
         # 计算运行时间
-        running_time = (datetime.now() - status["start_time"]).total_seconds()
+        running_time = (now or time.monotonic()) - process.start_time
+        is_alive = process.is_alive()
         
-        status.update({
-            "is_alive": process.is_alive(),
-            "exit_code": process.exitcode if not process.is_alive() else None,
+        return {
+            "start_time": process.start_time,
+            "pid": process.pid,
+            "site_id": process.site_id,
+            "is_alive": is_alive,
+            "exit_code": process.exitcode if not is_alive else None,
             "running_time": running_time,
             "is_timeout": running_time > self._task_timeout
-        })
-        
-        return status
-        
+        }
+
+    def get_running_task_ids(self) -> List[str]:
+        """获取当前进程仍存活的任务ID列表
+
+        运行状态只保存在本进程内存中，因此服务必须以单 worker 运行
+        （见 main.py 中 uvicorn 的 workers=1），否则各 worker 看到的运行集合不一致
+        """
+        return [task_id for task_id, process in self._processes.items() if process.is_alive()]
+
     async def start_crawlertask(self, db: AsyncSession) -> List[TaskResponse]:
         """启动所有READY状态的任务进程
         
@@ -267,18 +342,15 @@ class ProcessManager:
                         process = CrawlerProcess(
                             site_id=task.site_id,
                             task_id=task.task_id,
-                            log_dir=str(Path(__file__).parent.parent.parent / 'logs' / 'tasks')
+                            log_dir=_TASK_LOG_DIR
                         )
                         process.start()
-                        self.logger.info(f"任务 {task.task_id} 启动 (PID: {process.pid})")
+                        # 单调时钟，只用于计算运行时长
+                        process.start_time = time.monotonic()
+                        self._watch_process_exit(process)
                         
                         # 存储进程信息
                         self._processes[task.task_id] = process
-                        self._status[task.task_id] = {
-                            "start_time": datetime.now(),
-                            "pid": process.pid,
-                            "site_id": task.site_id
-                        }
                         
                         # 更新任务状态为RUNNING
                         await self._queue_manager._update_task_status(
@@ -296,14 +368,16 @@ class ProcessManager:
                         
                         # 记录运行中的任务
                         self._running_sites[task.site_id] = task.task_id
-                        started_tasks.append(TaskResponse.model_validate(task))
+                        started_tasks.append(TaskResponse.from_orm_trusted(task))
                         self.logger.info(f"任务 {task.task_id} 启动成功 (PID: {process.pid})")
                         
                     except Exception as e:
                         self.logger.error(f"启动任务 {task.task_id} 失败: {str(e)}")
-                        # 如果启动失败，确保清理任何可能创建的进程记录
-                        if task.task_id in self._processes:
-                            await self.cleanup_task(task.task_id)
+                        # 如果启动失败，确保清理任何可能创建的进程记录（已持有锁，不能调用 cleanup_task）
+                        process = self._processes.get(task.task_id)
+                        if process is not None:
+                            await self._stop_process(task.task_id, process)
+                            self._discard_task_records(task.task_id)
                         continue
                 
                 self.logger.info(f"成功启动 {len(started_tasks)}/{len(ready_tasks)} 个任务")
@@ -323,59 +397,96 @@ class ProcessManager:
     async def cleanup_task(self, task_id: str) -> bool:
         """清理任务进程
         
+        进程的终止和等待在锁外进行，并放到线程中执行 join，
+        既不阻塞事件循环，也允许多个任务的清理并行进行
+        
         Args:
             task_id: 任务ID
             
         Returns:
             bool: 是否成功清理
         """
-        async with self._lock:
-            try:
-                if task_id not in self._processes:
-                    self.logger.warning(f"任务 {task_id} 不存在或已清理")
-                    return False
-                
-                process = self._processes[task_id]
-                if process.is_alive():
-                    self.logger.info(f"停止进程 - 任务ID: {task_id}, PID: {process.pid}")
-                    process.terminate()
-                    process.join(timeout=5)
-                    if process.is_alive():
-                        self.logger.warning(f"进程未响应，强制终止 - 任务ID: {task_id}")
-                        process.kill()
-                        process.join()
-                
-                # 清理进程记录
-                del self._processes[task_id]
-                
-                # 清理状态记录
-                if task_id in self._status:
-                    site_id = self._status[task_id].get("site_id")
-                    if site_id and site_id in self._running_sites and self._running_sites[site_id] == task_id:
-                        del self._running_sites[site_id]
-                        self.logger.debug(f"已从运行中站点列表移除: {site_id}")
-                    del self._status[task_id]
-                
-                self.logger.info(f"任务 {task_id} 已清理")
-                return True
-                
-            except Exception as e:
-                self.logger.error(f"清理任务 {task_id} 失败: {str(e)}")
-                self.logger.debug("错误详情:", exc_info=True)
-                return False
+        process = self._processes.get(task_id)
+        if process is None:
+            self.logger.warning(f"任务 {task_id} 不存在或已清理")
+            return False
+        
+        try:
+            await self._stop_process(task_id, process)
+            
+            async with self._lock:
+                self._discard_task_records(task_id)
+            
+            self.logger.info(f"任务 {task_id} 已清理")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"清理任务 {task_id} 失败: {str(e)}")
+            self.logger.debug("错误详情:", exc_info=True)
+            return False
+    
+    async def _stop_process(self, task_id: str, process: CrawlerProcess) -> None:
+        """终止进程并等待其退出，超时后强制结束"""
+        if not process.is_alive():
+            return
+        self.logger.info(f"停止进程 - 任务ID: {task_id}, PID: {process.pid}")
+        process.terminate()
+        await asyncio.to_thread(process.join, 5)
+        if process.is_alive():
+            self.logger.warning(f"进程未响应，强制终止 - 任务ID: {task_id}")
+            process.kill()
+            await asyncio.to_thread(process.join)
+    
+    def _watch_process_exit(self, process: CrawlerProcess) -> None:
+        """监听进程的 sentinel，进程退出时唤醒周期检查
+        
+        事件循环不支持 add_reader 时（如 Windows 的 ProactorEventLoop）退回纯轮询
+        """
+        loop = asyncio.get_running_loop()
+        sentinel = process.sentinel
+        
+        def _on_exit():
+            loop.remove_reader(sentinel)
+            self._exit_event.set()
+        
+        try:
+            loop.add_reader(sentinel, _on_exit)
+        except (NotImplementedError, ValueError, OSError):
+            pass
+    
+    def _unwatch_process_exit(self, process: CrawlerProcess) -> None:
+        """取消对进程 sentinel 的监听，避免进程对象回收后残留失效的描述符"""
+        try:
+            asyncio.get_running_loop().remove_reader(process.sentinel)
+        except (NotImplementedError, ValueError, OSError):
+            pass
+    
+    def _discard_task_records(self, task_id: str) -> None:
+        """移除任务的进程和运行状态记录，调用方需持有 self._lock"""
+        # 清理进程记录
+        process = self._processes.pop(task_id, None)
+        if process is None:
+            return
+        self._unwatch_process_exit(process)
+        
+        # 清理运行中站点记录
+        site_id = process.site_id
+        if self._running_sites.get(site_id) == task_id:
+            del self._running_sites[site_id]
+            self.logger.debug(f"已从运行中站点列表移除: {site_id}")
                 
     async def check_all_tasks(self):
         """检查所有任务的状态"""
         try:
-            # 获取新的数据库会话
-            if not self._db:
-                from core import database
-                self._db = await database.get_init_db()
-            try:
+            # 每轮检查使用独立的短生命周期会话，检查结束即归还连接，不占用共享会话
+            from core import database
+            async with database.async_session() as db:
                 task_ids = list(self._processes.keys())
+                # 本轮检查共用同一个当前时间
+                now = time.monotonic()
                 for task_id in task_ids:
                     try:
-                        status = await self.check_task_status(task_id)
+                        status = await self.check_task_status(task_id, now)
                         if status:
                             # 检查是否超时
                             if status["is_alive"] and status["is_timeout"]:
@@ -384,7 +495,7 @@ class ProcessManager:
                                 await self.cleanup_task(task_id)
                                 # 更新任务状态为失败
                                 await self._queue_manager._update_task_status(
-                                    db=self._db,
+                                    db=db,
                                     task_id=task_id,
                                     status=TaskStatus.FAILED,
                                     msg=f"任务执行超时（{status['running_time']:.1f}s > {self._task_timeout}s）"
@@ -394,21 +505,18 @@ class ProcessManager:
                             # 如果进程已经结束
                             if not status["is_alive"]:
                                 self.logger.info(f"任务 {task_id} 进程已结束 (退出码: {status['exit_code']})")
-                                # 获取站点ID用于清理
-                                site_id = self._status[task_id].get("site_id") if task_id in self._status else None
-                                
                                 # 根据退出码更新任务状态
                                 if status["exit_code"] == 0:
                                     await self._queue_manager.complete_task(
                                         task_id,
-                                        self._db,
+                                        db,
                                         TaskStatus.SUCCESS,
                                         f"任务执行完成（耗时：{status['running_time']:.1f}s）"
                                     )
                                 else:
                                     await self._queue_manager.complete_task(
                                         task_id,
-                                        self._db,
+                                        db,
                                         TaskStatus.FAILED,
                                         f"任务执行失败（退出码: {status['exit_code']}，耗时：{status['running_time']:.1f}s）"
                                     )
@@ -427,14 +535,9 @@ class ProcessManager:
                 running_count = len(self._running_sites)
                 if running_count < self._max_concurrency:
                     self.logger.debug(f"当前运行任务数: {running_count}, 尝试启动新任务")
-                    started_tasks = await self.start_crawlertask(self._db)
+                    started_tasks = await self.start_crawlertask(db)
                     if started_tasks:
                         self.logger.info(f"定期检查时启动了 {len(started_tasks)} 个新任务")
-                
-            finally:
-                if self._db:
-                    await self._db.close()
-                    self._db = None
                     
         except Exception as e:
             self.logger.error(f"检查任务状态时出错: {str(e)}")
@@ -442,36 +545,58 @@ class ProcessManager:
             
     async def cleanup(self):
         """清理所有进程"""
-        async with self._lock:
-            try:
-                self.logger.info("开始清理所有进程")
-                # 获取所有正在运行的任务
-                running_tasks = list(self._processes.keys())
-                
-                # 清理每个任务
+        # cleanup_task 内部会获取 self._lock，这里不能再持有同一把锁
+        try:
+            self.logger.info("开始清理所有进程")
+            # 先停止定期检查，避免清理过程中又启动新的任务进程
+            if self._check_task is not None:
+                self._check_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await self._check_task
+                self._check_task = None
+            
+            # 获取所有正在运行的任务
+            running_tasks = list(self._processes.keys())
+            
+            # 先向所有存活进程发送终止信号，使各进程并行退出，而不是逐个等待超时
+            for task_id in running_tasks:
+                process = self._processes.get(task_id)
+                if process and process.is_alive():
+                    process.terminate()
+            
+            # 并发回收所有进程（限制同时进行的数量），单个任务失败不影响其他任务
+            limiter = asyncio.Semaphore(_CLEANUP_CONCURRENCY)
+            
+            async def _limited_cleanup(task_id: str) -> bool:
+                async with limiter:
+                    return await self.cleanup_task(task_id)
+            
+            results = await asyncio.gather(
+                *(_limited_cleanup(task_id) for task_id in running_tasks),
+                return_exceptions=True
+            )
+            for task_id, result in zip(running_tasks, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"清理任务 {task_id} 时发生错误: {str(result)}")
+            
+            # 更新任务状态为已取消（共享同一会话，需顺序执行）
+            if self._db and self._queue_manager:
                 for task_id in running_tasks:
                     try:
-                        # 清理进程
-                        await self.cleanup_task(task_id)
-                        
-                        # 更新任务状态为已取消
-                        if self._db and self._queue_manager:
-                            await self._queue_manager.cancel_task(task_id, self._db)
-                            
+                        await self._queue_manager.cancel_task(task_id, self._db)
                     except Exception as e:
-                        self.logger.error(f"清理任务 {task_id} 时发生错误: {str(e)}")
+                        self.logger.error(f"取消任务 {task_id} 时发生错误: {str(e)}")
                         self.logger.debug("错误详情:", exc_info=True)
-                        continue
-                
-                self.logger.info(f"成功清理 {len(running_tasks)} 个进程")
+            
+            self.logger.info(f"成功清理 {len(running_tasks)} 个进程")
+            
+            if self._db:
+                await self._db.close()
                 
-                if self._db:
-                    await self._db.close()
-                    
-            except Exception as e:
-                self.logger.error(f"清理进程时发生错误: {str(e)}")
-                self.logger.debug("错误详情:", exc_info=True)
-                raise
+        except Exception as e:
+            self.logger.error(f"清理进程时发生错误: {str(e)}")
+            self.logger.debug("错误详情:", exc_info=True)
+            raise
 
 
 # 全局进程管理器实例
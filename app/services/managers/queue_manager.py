@@ -1,5 +1,5 @@
 import asyncio
-import traceback
+import contextlib
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
@@ -7,10 +7,23 @@ from typing import Dict, List, Optional
 from core.logger import get_logger, setup_logger
 from models.models import Task, TaskStatus
 from schemas.task import TaskCreate, TaskResponse, TaskUpdate
-from services.managers.task_status_manager import task_status_manager
-from sqlalchemy import select
+from services.managers.task_status_manager import (SELECT_TASK_STATUS_STMT,
+                                                   task_status_manager)
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# 预构建的常用查询语句
+_COUNT_RUNNING_TASKS_STMT = select(func.count()).select_from(Task).where(Task.status == TaskStatus.RUNNING)
+
+# 已结束、不能再变更的任务状态
+_FINISHED_STATUSES = (TaskStatus.SUCCESS, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+# 队列空闲时检查间隔最多放大到基础间隔的倍数
+_MAX_IDLE_BACKOFF = 4
+
+# 批量插入任务时每批的行数
+_INSERT_CHUNK_SIZE = 1000
+
 
 class QueueManager:
     def __init__(self):
@@ -19,87 +32,121 @@ class QueueManager:
         self._task_info: Dict[str, Dict] = {}  # task_id -> task_info
         self._lock = asyncio.Lock()
         self._max_concurrency = 1
+        self._check_interval = 30.0  # 队列定期检查间隔（秒）
+        self._last_queue_stats = None  # 上一轮记录的 (运行中, 就绪) 数量
+        self._wakeup = asyncio.Event()  # 有新任务入队时置位，立即唤醒定期检查
+        self._check_task: Optional[asyncio.Task] = None  # 定期检查任务，关闭时取消
         self.logger = get_logger(name=__name__, site_id="QueueMgr")
 
-    async def initialize(self, max_concurrency: int = 1) -> None:
+    async def initialize(self, max_concurrency: int = 1, start_periodic_check: bool = True) -> None:
         """初始化队列管理器
         
+        爬虫子进程 fork 时会复制父进程中已初始化的全局实例，其中的锁、事件和定期检查任务
+        属于父进程的事件循环（锁还可能在 fork 时处于被持有状态），因此每次初始化都重建这些状态
+        
         Args:
             max_concurrency: 最大并发数
+            start_periodic_check: 是否启动定期检查任务，爬虫子进程中不需要
         """
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._check_task = None
+        self._last_queue_stats = None
+        # 内存队列只在主进程中有意义，子进程中复制来的副本直接丢弃
+        self._queues = defaultdict(list)
+        self._ready_tasks = {}
+        self._task_info = {}
         self._max_concurrency = max_concurrency
+        from services.managers.setting_manager import SettingManager
+        self._check_interval = float(await SettingManager.get_instance().get_setting("queue_check_interval") or 30)
         self.logger.info(f"Queue manager initialized with max concurrency: {max_concurrency}")
         
-        # 启动定期检查任务
-        asyncio.create_task(self._periodic_queue_check())
+        # 启动定期检查任务，保留引用以便关闭时取消
+        if start_periodic_check:
+            self._check_task = asyncio.create_task(self._periodic_queue_check())
         
     async def _periodic_queue_check(self):
-        """定期检查队列状态并处理任务"""
+        """定期检查队列状态并处理任务
+        
+        有任务运行、就绪或排队时按基础间隔检查；队列空闲时每轮加倍间隔，
+        最多为基础间隔的 _MAX_IDLE_BACKOFF 倍。start_queue 会立即唤醒检查并恢复基础间隔
+        """
+        interval = self._check_interval
         while True:
-            try:
-                # 获取数据库会话
-                self.logger.info("周期检查队列状态")
-                from core import database
-                db = await database.get_init_db()
-                
-                # 获取当前运行中的任务数量
-                stmt = select(Task).where(Task.status == TaskStatus.RUNNING)
-                result = await db.execute(stmt)
-                running_tasks = result.scalars().all()
-                running_count = len(running_tasks)
+            has_work = True
+            # 每轮检查使用独立的短生命周期会话，退出上下文时自动关闭
+            from core import database
+            async with database.async_session() as db:
+                try:
+                    # 获取当前运行中的任务数量，只在数据库中计数
+                    running_count = (await db.execute(_COUNT_RUNNING_TASKS_STMT)).scalar_one()
 
-                # 计算可用槽位时考虑运行中的任务
-                total_in_progress = running_count + len(self._ready_tasks)
-                self.logger.success(f"当前运行中的任务数量: {running_count}, 已准备就绪的任务数量: {len(self._ready_tasks)}, 总任务数量: {total_in_progress}")
-                self.logger.success(f"当前最大并发数: {self._max_concurrency}")
-                self.logger.success(f"当前self._queues状态: {self._queues}")
-                self.logger.success(f"当前self._ready_tasks状态: {self._ready_tasks}")
-                if total_in_progress < self._max_concurrency:
-                    available_slots = self._max_concurrency - total_in_progress
-                    
-                    # 获取QUEUED状态的任务
-                    stmt = (
-                        select(Task)
-                        .where(
-                            Task.status == TaskStatus.QUEUED,
-                            Task.created_at <= datetime.now() - timedelta(seconds=5)
+                    # 计算可用槽位时考虑运行中的任务
+                    total_in_progress = running_count + len(self._ready_tasks)
+                    # 内存队列中仍有已入队但未结束的任务时视为非空闲
+                    has_work = bool(total_in_progress or self._task_info)
+                    # 队列状态没有变化时不重复输出
+                    queue_stats = (running_count, len(self._ready_tasks))
+                    if queue_stats != self._last_queue_stats:
+                        self._last_queue_stats = queue_stats
+                        self.logger.debug(
+                            f"运行中: {running_count}, 就绪: {len(self._ready_tasks)}, "
+                            f"总数: {total_in_progress}, 最大并发: {self._max_concurrency}"
                         )
-                        .order_by(Task.created_at.asc())
-                        .limit(available_slots)
-                    )
-                    result = await db.execute(stmt)
-                    queued_tasks = result.scalars().all()
-                    
-                    # 将任务标记为READY
-                    for task in queued_tasks:
-                        # 检查站点是否已有READY任务
-                        if task.site_id in self._ready_tasks:
-                            self.logger.debug(f"站点 {task.site_id} 已有READY状态任务，跳过")
-                            continue
-                        
-                        await self._update_task_status(
-                            db,
-                            task.task_id,
-                            TaskStatus.READY,
-                            "任务准备就绪"
+                    if total_in_progress < self._max_concurrency:
+                        available_slots = self._max_concurrency - total_in_progress
+
+                        # 获取QUEUED状态的任务，只查询需要的列
+                        stmt = (
+                            select(Task.task_id, Task.site_id)
+                            .where(
+                                Task.status == TaskStatus.QUEUED,
+                                Task.created_at <= datetime.now() - timedelta(seconds=5)
+                            )
+                            .order_by(Task.created_at.asc())
+                            .limit(available_slots)
                         )
-                        # 更新ready_tasks状态
-                        self._ready_tasks[task.site_id] = task.task_id
-                        self.logger.info(f"任务 {task.task_id} 已标记为READY状态")
-                
-                await db.commit()
-                
-            except Exception as e:
-                self.logger.error(f"队列检查失败: {str(e)}")
-                self.logger.debug("错误详情:", exc_info=True)
-                if db:
-                    await db.rollback()
-            finally:
-                if db:
-                    await db.close()
+                        result = await db.execute(stmt)
+                        queued_tasks = result.all()
+
+                        # 将任务标记为READY
+                        ready_ids = []
+                        for task in queued_tasks:
+                            # 检查站点是否已有READY任务
+                            if task.site_id in self._ready_tasks:
+                                self.logger.debug(f"站点 {task.site_id} 已有READY状态任务，跳过")
+                                continue
+
+                            ready_ids.append(task.task_id)
+                            # 更新ready_tasks状态
+                            self._ready_tasks[task.site_id] = task.task_id
+                            self.logger.info(f"任务 {task.task_id} 已标记为READY状态")
+
+                        # 一条 UPDATE 批量写入状态
+                        if ready_ids:
+                            await db.execute(
+                                update(Task)
+                                .where(Task.task_id.in_(ready_ids))
+                                .values(status=TaskStatus.READY, msg="任务准备就绪", updated_at=datetime.now())
+                            )
+
+                    await db.commit()
                     
-            # 每30秒检查一次
-            await asyncio.sleep(30)
+                except Exception as e:
+                    self.logger.error(f"队列检查失败: {str(e)}")
+                    self.logger.debug("错误详情:", exc_info=True)
+                    await db.rollback()
+            
+            if has_work:
+                interval = self._check_interval
+            else:
+                interval = min(interval * 2, self._check_interval * _MAX_IDLE_BACKOFF)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+                interval = self._check_interval
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
 
     async def _update_task_status(self, db: AsyncSession, task_id: str, status: TaskStatus, 
                                 msg: Optional[str] = None,
@@ -194,27 +241,27 @@ class QueueManager:
         """
         async with self._lock:
             try:
-                # 创建任务记录
+                # 创建任务记录，优先沿用调用方给出的创建时间
+                now = task.created_at or datetime.now()
                 db_task = Task(
                     task_id=task.task_id,
                     site_id=task.site_id,
                     status=TaskStatus.PENDING,
-                    created_at=datetime.now(),
-                    updated_at=datetime.now(),
+                    created_at=now,
+                    updated_at=now,
                 )
                 db.add(db_task)
                 await db.commit()
-                await db.refresh(db_task)
                 
                 # 添加到队列
                 self._queues[task.site_id].append(task.task_id)
                 self._task_info[task.task_id] = {
-                    "queued_at": datetime.now(),
+                    "queued_at": now,
                     "site_id": task.site_id,
                 }
                 
                 self.logger.info(f"任务 {task.task_id} 已添加到队列")
-                return TaskResponse.model_validate(db_task)
+                return TaskResponse.from_orm_trusted(db_task)
                 
             except Exception as e:
                 error_msg = str(e)
@@ -223,110 +270,159 @@ class QueueManager:
                 await db.rollback()
                 return None
     
+    async def add_tasks(self, tasks: List[TaskCreate], db: AsyncSession) -> List[TaskResponse]:
+        """批量添加新任务到队列
+        
+        按 _INSERT_CHUNK_SIZE 分块执行 executemany 插入，全部写入后只提交一次。
+        批量写入失败时回退为逐个添加，单个任务失败不影响其他任务
+        
+        Args:
+            tasks: 任务创建模型列表
+            db: 数据库会话
+            
+        Returns:
+            List[TaskResponse]: 成功添加的任务列表
+        """
+        if not tasks:
+            return []
+        
+        rows = []
+        for task in tasks:
+            now = task.created_at or datetime.now()
+            rows.append({
+                "task_id": task.task_id,
+                "site_id": task.site_id,
+                "status": TaskStatus.PENDING,
+                "created_at": now,
+                "updated_at": now,
+            })
+        
+        async with self._lock:
+            try:
+                for start in range(0, len(rows), _INSERT_CHUNK_SIZE):
+                    await db.execute(insert(Task), rows[start:start + _INSERT_CHUNK_SIZE])
+                await db.commit()
+                
+                # 添加到队列
+                for row in rows:
+                    self._queues[row["site_id"]].append(row["task_id"])
+                    self._task_info[row["task_id"]] = {
+                        "queued_at": row["created_at"],
+                        "site_id": row["site_id"],
+                    }
+                
+                self.logger.info(f"已批量添加 {len(rows)} 个任务到队列")
+                return [TaskResponse.from_orm_trusted(row) for row in rows]
+                
+            except Exception as e:
+                self.logger.warning(f"批量添加任务失败，改为逐个添加: {str(e)}")
+                self.logger.debug("错误详情:", exc_info=True)
+                await db.rollback()
+        
+        responses = []
+        for task in tasks:
+            response = await self.add_task(task, db)
+            if response:
+                responses.append(response)
+        return responses
+    
     async def complete_task(self, task_id: str, db: AsyncSession, 
                             status: TaskStatus = TaskStatus.SUCCESS, 
                             msg: str = None) -> bool:
         """完成任务"""
         async with self._lock:
             try:
-                # 获取任务信息
-                stmt = select(Task).where(Task.task_id == task_id)
-                result = await db.execute(stmt)
-                task = result.scalar_one_or_none()
-                
-                if not task:
-                    self.logger.error(f"任务不存在: {task_id}")
-                    return False
-                
-                # 只有RUNNING状态的任务可以被完成
-                if task.status != TaskStatus.RUNNING:
-                    self.logger.warning(f"任务 {task_id} 状态为 {task.status}，不能标记为完成")
-                    return False
-                
-                # 更新任务状态
-                await self._update_task_status(
-                    db=db,
-                    task_id=task_id,
-                    status=status,
-                    msg=msg,
-                    completed_at=datetime.now()
+                # 只有RUNNING状态的任务可以被完成，条件与更新合并为一条 UPDATE
+                site_id = await self._finish_task(
+                    db, task_id, status, msg,
+                    Task.status == TaskStatus.RUNNING
                 )
+                if site_id is None:
+                    await self._log_rejected_transition(db, task_id, "不能标记为完成")
+                    return False
                 
                 # 清理队列信息
-                site_id = task.site_id
-                if task_id in self._task_info:
-                    del self._task_info[task_id]
-                if task_id in self._queues[site_id]:
-                    self._queues[site_id].remove(task_id)
-                if site_id in self._ready_tasks and self._ready_tasks[site_id] == task_id:
-                    del self._ready_tasks[site_id]
+                self._discard_queue_state(task_id, site_id)
                 
                 self.logger.info(f"任务 {task_id} 已完成，状态: {status}")
                 return True
                 
             except Exception as e:
                 error_msg = str(e)
-                error_details = {
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc()
-                }
                 self.logger.error(f"完成任务失败: {error_msg}")
                 self.logger.debug("错误详情:", exc_info=True)
+                await db.rollback()
                 return False
     
     async def cancel_task(self, task_id: str, db: AsyncSession) -> bool:
         """取消任务"""
         async with self._lock:
             try:
-                # 获取任务信息
-                stmt = select(Task).where(Task.task_id == task_id)
-                result = await db.execute(stmt)
-                task = result.scalar_one_or_none()
-                
-                if not task:
-                    self.logger.error(f"任务不存在: {task_id}")
-                    return False
-                
-                # 检查任务是否可以取消
-                if task.status in [TaskStatus.SUCCESS, TaskStatus.FAILED, TaskStatus.CANCELLED]:
-                    self.logger.warning(f"任务 {task_id} 状态为 {task.status}，不能取消")
-                    return False
-                
-                # 更新任务状态
-                await self._update_task_status(
-                    db=db,
-                    task_id=task_id,
-                    status=TaskStatus.CANCELLED,
-                    msg="任务已取消",
-                    completed_at=datetime.now()
+                # 已结束的任务不能取消，条件与更新合并为一条 UPDATE
+                site_id = await self._finish_task(
+                    db, task_id, TaskStatus.CANCELLED, "任务已取消",
+                    Task.status.not_in(_FINISHED_STATUSES)
                 )
+                if site_id is None:
+                    await self._log_rejected_transition(db, task_id, "不能取消")
+                    return False
                 
-                # 清理运行状态
-                site_id = task.site_id
-                if site_id in self._ready_tasks and self._ready_tasks[site_id] == task_id:
-                    del self._ready_tasks[site_id]
-                
-                # 清理队列信息
-                if task_id in self._task_info:
-                    del self._task_info[task_id]
-                if task_id in self._queues[site_id]:
-                    self._queues[site_id].remove(task_id)
+                # 清理运行状态和队列信息
+                self._discard_queue_state(task_id, site_id)
                 
                 self.logger.info(f"任务 {task_id} 已取消")
                 return True
                 
             except Exception as e:
                 error_msg = str(e)
-                error_details = {
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc()
-                }
                 self.logger.error(f"取消任务失败: {error_msg}")
                 self.logger.debug("错误详情:", exc_info=True)
+                await db.rollback()
                 return False
     
+    async def _finish_task(self, db: AsyncSession, task_id: str, status: TaskStatus,
+                           msg: Optional[str], condition) -> Optional[str]:
+        """将满足条件的任务置为结束状态并提交
+        
+        Returns:
+            Optional[str]: 任务的站点ID；任务不存在或状态不满足条件时返回 None
+        """
+        now = datetime.now()
+        values = {"status": status, "completed_at": now, "updated_at": now}
+        if msg:
+            values["msg"] = msg
+        result = await db.execute(
+            update(Task)
+            .where(Task.task_id == task_id, condition)
+            .values(**values)
+            .returning(Task.site_id)
+        )
+        site_id = result.scalar_one_or_none()
+        await db.commit()
+        
+        if site_id is not None:
+            self.logger.info(f"[站点: {site_id}] 任务 {task_id} 状态更新为 {status.value}")
+            if msg:
+                self.logger.debug(f"[站点: {site_id}] 任务状态消息: {msg}")
+        return site_id
+    
+    async def _log_rejected_transition(self, db: AsyncSession, task_id: str, action: str) -> None:
+        """状态更新未命中时，区分任务不存在与状态不允许两种情况记录日志"""
+        result = await db.execute(SELECT_TASK_STATUS_STMT, {"task_id": task_id})
+        current_status = result.scalar_one_or_none()
+        if current_status is None:
+            self.logger.error(f"任务不存在: {task_id}")
+        else:
+            self.logger.warning(f"任务 {task_id} 状态为 {current_status}，{action}")
+    
+    def _discard_queue_state(self, task_id: str, site_id: str) -> None:
+        """移除已结束任务的内存队列信息，调用方需持有 self._lock"""
+        if site_id in self._ready_tasks and self._ready_tasks[site_id] == task_id:
+            del self._ready_tasks[site_id]
+        self._task_info.pop(task_id, None)
+        if task_id in self._queues[site_id]:
+            self._queues[site_id].remove(task_id)
+    
     async def clear_pending_tasks(self, db: AsyncSession, site_id: str = None) -> dict:
         """清除待运行的任务队列
         
@@ -339,53 +435,42 @@ class QueueManager:
         """
         async with self._lock:
             try:
-                cleared_count = 0
-                total_count = 0
-                
-                # 从数据库中获取READY状态的任务
-                query = select(Task).where(Task.status == TaskStatus.READY)
+                # 一条 UPDATE 将READY状态的任务全部取消，并返回受影响的任务
+                now = datetime.now()
+                stmt = (
+                    update(Task)
+                    .where(Task.status == TaskStatus.READY)
+                    .values(status=TaskStatus.CANCELLED, msg="任务已取消", completed_at=now, updated_at=now)
+                    .returning(Task.task_id, Task.site_id)
+                )
                 if site_id:
-                    query = query.where(Task.site_id == site_id)
+                    stmt = stmt.where(Task.site_id == site_id)
                 
-                result = await db.execute(query)
-                ready_tasks = result.scalars().all()
+                result = await db.execute(stmt)
+                ready_tasks = result.all()
+                
+                # 提交所有更改
+                await db.commit()
                 
                 # 记录总任务数
                 total_count = len(ready_tasks)
+                cleared_count = 0
                 
-                # 清除每个READY状态的任务
+                # 清理每个已取消任务的内存状态
                 for task in ready_tasks:
-                    try:
-                        # 从内存队列中移除任务
-                        if task.task_id in self._queues[task.site_id]:
-                            self._queues[task.site_id].remove(task.task_id)
-                        
-                        # 清理任务信息
-                        if task.task_id in self._task_info:
-                            del self._task_info[task.task_id]
-                        
-                        # 更新任务状态
-                        await self._update_task_status(
-                            db=db,
-                            task_id=task.task_id,
-                            status=TaskStatus.CANCELLED,
-                            msg="任务已取消",
-                            completed_at=datetime.now()
-                        )
-                        
-                        # 清理 ready_tasks
-                        if task.site_id in self._ready_tasks and self._ready_tasks[task.site_id] == task.task_id:
-                            del self._ready_tasks[task.site_id]
-                        
-                        cleared_count += 1
-                        self.logger.debug(f"已清除任务: {task.task_id}")
-                        
-                    except Exception as e:
-                        self.logger.error(f"清除任务 {task.task_id} 失败: {str(e)}")
-                        continue
-                
-                # 提交所有更改
-                await db.commit()
+                    # 从内存队列中移除任务
+                    if task.task_id in self._queues[task.site_id]:
+                        self._queues[task.site_id].remove(task.task_id)
+                    
+                    # 清理任务信息
+                    self._task_info.pop(task.task_id, None)
+                    
+                    # 清理 ready_tasks
+                    if self._ready_tasks.get(task.site_id) == task.task_id:
+                        del self._ready_tasks[task.site_id]
+                    
+                    cleared_count += 1
+                    self.logger.debug(f"已清除任务: {task.task_id}")
                 
                 self.logger.info(f"成功清除 {cleared_count}/{total_count} 个待运行任务")
                 return {
@@ -414,32 +499,31 @@ class QueueManager:
         """
         async with self._lock:
             try:
-                # 1. 将所有PENDING任务转为QUEUED
+                # 1. 一条 UPDATE 将所有PENDING任务转为QUEUED
+                now = datetime.now()
                 stmt = (
-                    select(Task)
+                    update(Task)
                     .where(Task.status == TaskStatus.PENDING)
-                    .order_by(Task.created_at.asc())
+                    .values(status=TaskStatus.QUEUED, msg="任务已加入队列", updated_at=now)
+                    .returning(Task.task_id, Task.site_id, Task.created_at)
                 )
                 result = await db.execute(stmt)
-                pending_tasks = result.scalars().all()
+                # RETURNING 不保证顺序，按创建时间排序后再入内存队列
+                pending_tasks = sorted(result.all(), key=lambda row: row.created_at)
                 
                 for task in pending_tasks:
-                    await self._update_task_status(
-                        db,
-                        task.task_id,
-                        TaskStatus.QUEUED,
-                        "任务已加入队列"
-                    )
                     # 确保任务在内存队列中
                     if task.task_id not in self._queues[task.site_id]:
                         self._queues[task.site_id].append(task.task_id)
                         self._task_info[task.task_id] = {
-                            "queued_at": datetime.now(),
+                            "queued_at": now,
                             "site_id": task.site_id,
                         }
                 
                 self.logger.info(f"已将 {len(pending_tasks)} 个PENDING任务转为QUEUED状态")
                 await db.commit()
+                if pending_tasks:
+                    self._wakeup.set()
                 return True
                 
             except Exception as e:
@@ -450,21 +534,43 @@ class QueueManager:
 
     async def cleanup(self, db: AsyncSession):
         """清理所有队列"""
-        async with self._lock:
-            try:
-                # 取消所有排队的任务
-                for site_id, task_ids in self._queues.items():
-                    for task_id in task_ids:
-                        await self.cancel_task(task_id, db)
-                
-                # 清理状态
+        try:
+            # 先停止定期检查
+            if self._check_task is not None:
+                self._check_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await self._check_task
+                self._check_task = None
+            
+            # 取消所有排队的任务（cancel_task 内部会获取 self._lock，这里不能再持有同一把锁）
+            task_ids = [task_id for queue in self._queues.values() for task_id in queue]
+            for task_id in task_ids:
+                await self.cancel_task(task_id, db)
+            
+            # 清理状态
+            async with self._lock:
                 self._queues.clear()
                 self._task_info.clear()
                 self._ready_tasks.clear()
-                
-            except Exception as e:
-                self.logger.error(f"清理队列失败: {str(e)}")
-                self.logger.debug("错误详情:", exc_info=True)
+            
+        except Exception as e:
+            self.logger.error(f"清理队列失败: {str(e)}")
+            self.logger.debug("错误详情:", exc_info=True)
+
+    async def discard_task(self, task_id: str, site_id: str) -> None:
+        """从内存队列中移除已在数据库中取消的任务
+        
+        Args:
+            task_id: 任务ID
+            site_id: 站点ID
+        """
+        async with self._lock:
+            self._task_info.pop(task_id, None)
+            if task_id in self._queues[site_id]:
+                self._queues[site_id].remove(task_id)
+            if self._ready_tasks.get(site_id) == task_id:
+                del self._ready_tasks[site_id]
+            self.logger.debug(f"从内存队列中移除任务: {task_id}")
 
     async def remove_ready_task(self, task_id: str, site_id: str) -> None:
         """从 ready_tasks 中移除任务
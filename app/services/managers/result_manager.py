@@ -78,7 +78,6 @@ class ResultManager:
             # 3. 保存到数据库
             self.session.add(result)
             await self.session.commit()
-            await self.session.refresh(result)
             
             self.logger.info(f"保存爬虫结果成功 - 任务ID: {result_data.task_id}")
             return result
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import platform
 import zipfile
@@ -15,6 +16,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 env_path = Path(__file__).parent.parent.parent / '.env'
 load_dotenv(env_path)
 
+# 以逗号分隔存储、读取时返回列表的配置项
+_LIST_SETTING_KEYS = frozenset({'CAPTCHA_SKIP_SITES', 'CHECKIN_SITES'})
+
 class SettingManager:
     """设置管理器"""
     _instance = None
@@ -150,6 +154,7 @@ class SettingManager:
         获取配置值
         
         如果配置项为列表,如CAPTCHA_SKIP_SITES, CHECKIN_SITES, 则返回列表
+        缓存中保存的是解析后的最终值，列表项只在首次读取时拆分
         """
         # 先从缓存获取
         if key in self._cache:
@@ -160,13 +165,13 @@ class SettingManager:
             
         # 从数据库配置获取
         value = getattr(self._settings, key, None)
-        if value is not None:
-            self._cache[key] = value
         
         # 如果配置项为列表,如CAPTCHA_SKIP_SITES, CHECKIN_SITES, 则返回列表
-        if key.upper() in ['CAPTCHA_SKIP_SITES', 'CHECKIN_SITES']:
-            value: list[str] = value.split(',')
-            return value
+        if value is not None and key.upper() in _LIST_SETTING_KEYS:
+            value = value.split(',')
+        
+        if value is not None:
+            self._cache[key] = value
         
         return value
     
@@ -184,8 +189,8 @@ class SettingManager:
             setattr(self._settings, key, value)
             await db.commit()
             
-            # 更新缓存
-            self._cache[key] = value
+            # 使缓存失效，下次读取时重新解析
+            self._cache.pop(key, None)
             self.logger.debug(f"Setting updated: {key} = {value}")
             
         except Exception as e:
@@ -232,7 +237,7 @@ class SettingManager:
             for key, value in settings.items():
                 if hasattr(current_settings, key):
                     setattr(current_settings, key, value)
-                    self._cache[key] = value
+                    self._cache.pop(key, None)
             
             # 更新内存中的实例
             self._settings = current_settings
@@ -358,6 +363,86 @@ class SettingManager:
             self.logger.error(f"Failed to reset settings: {str(e)}", exc_info=True)
             raise
 
+    def _install_chrome(self, system: str, platform_path: str, chrome_dir: Path,
+                        chrome_exe: Path, chrome_app: Path, zip_name: str) -> None:
+        """下载并解压便携版 Chrome（阻塞操作，由 ensure_chrome_exists 在线程中调用）"""
+        zip_path = chrome_dir / zip_name
+
+        # 检查是否已有压缩包
+        need_download = True
+        if zip_path.exists() and zip_path.stat().st_size > 0:
+            try:
+                # 验证现有zip文件完整性
+                with zipfile.ZipFile(zip_path, 'r') as zf:
+                    if zf.testzip() is None:
+                        self.logger.info(f"Found existing Chrome package at {zip_path}")
+                        need_download = False
+                    else:
+                        self.logger.warning("Existing Chrome package is corrupted, will download again")
+                        zip_path.unlink()
+            except zipfile.BadZipFile:
+                self.logger.warning("Existing Chrome package is invalid, will download again")
+                zip_path.unlink()
+
+        if need_download:
+            # 获取最新版本号
+            version_url = f"https://storage.googleapis.com/chromium-browser-snapshots/{platform_path}/LAST_CHANGE"
+            self.logger.info(f"Getting latest Chrome version from {version_url}")
+            response = requests.get(version_url)
+            if not response.ok:
+                raise Exception(f"Failed to get latest version: {response.status_code}")
+            latest_version = response.text.strip()
+            
+            # 构建下载URL
+            download_url = f"https://storage.googleapis.com/chromium-browser-snapshots/{platform_path}/{latest_version}/{zip_name}"
+            self.logger.info(f"Downloading Chrome version {latest_version} from {download_url}")
+            
+            # 下载Chrome
+            response = requests.get(download_url, stream=True)
+            if not response.ok:
+                raise Exception(f"Download failed with status code: {response.status_code}")
+
+            # 获取文件大小
+            total_size = int(response.headers.get('content-length', 0))
+
+            # 下载文件并显示进度
+            block_size = 1024 * 1024  # 1MB
+            downloaded_size = 0
+
+            with open(zip_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=block_size):
+                    if chunk:
+                        f.write(chunk)
+                        downloaded_size += len(chunk)
+                        # 惰性求值，日志级别未启用时不做格式化
+                        self.logger.opt(lazy=True).debug(
+                            "Download progress: {:.1f}%",
+                            lambda: (downloaded_size / total_size) * 100
+                        )
+
+        # 解压Chrome
+        self.logger.info("Extracting Chrome...")
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zf:
+                zf.extractall(chrome_dir)
+        except zipfile.BadZipFile as e:
+            raise Exception(f"Failed to extract Chrome package: {str(e)}")
+
+        # 设置执行权限
+        if system in ['linux', 'darwin']:
+            if system == 'darwin':
+                # Mac 平台设置应用程序包的权限
+                os.system(f'xattr -rd com.apple.quarantine "{chrome_app}"')
+                # 递归设置执行权限
+                os.system(f'chmod -R +x "{chrome_app}"')
+            else:
+                # Linux 只需要设置可执行文件权限
+                chrome_exe.chmod(0o755)
+
+        # 验证应用是否存在
+        if not chrome_app.exists():
+            raise Exception(f"Chrome application not found at {chrome_app}")
+
     async def ensure_chrome_exists(self, db: AsyncSession) -> Optional[str]:
         """确保 Chrome 存在，如果不存在则下载便携版"""
         try:
@@ -395,80 +480,11 @@ class SettingManager:
             else:
                 raise NotImplementedError(f"Unsupported system: {system}")
 
-            zip_path = chrome_dir / zip_name
-
             if not chrome_app.exists():
-                # 检查是否已有压缩包
-                need_download = True
-                if zip_path.exists() and zip_path.stat().st_size > 0:
-                    try:
-                        # 验证现有zip文件完整性
-                        with zipfile.ZipFile(zip_path, 'r') as zf:
-                            if zf.testzip() is None:
-                                self.logger.info(f"Found existing Chrome package at {zip_path}")
-                                need_download = False
-                            else:
-                                self.logger.warning("Existing Chrome package is corrupted, will download again")
-                                zip_path.unlink()
-                    except zipfile.BadZipFile:
-                        self.logger.warning("Existing Chrome package is invalid, will download again")
-                        zip_path.unlink()
-
-                if need_download:
-                    # 获取最新版本号
-                    version_url = f"https://storage.googleapis.com/chromium-browser-snapshots/{platform_path}/LAST_CHANGE"
-                    self.logger.info(f"Getting latest Chrome version from {version_url}")
-                    response = requests.get(version_url)
-                    if not response.ok:
-                        raise Exception(f"Failed to get latest version: {response.status_code}")
-                    latest_version = response.text.strip()
-                    
-                    # 构建下载URL
-                    download_url = f"https://storage.googleapis.com/chromium-browser-snapshots/{platform_path}/{latest_version}/{zip_name}"
-                    self.logger.info(f"Downloading Chrome version {latest_version} from {download_url}")
-                    
-                    # 下载Chrome
-                    response = requests.get(download_url, stream=True)
-                    if not response.ok:
-                        raise Exception(f"Download failed with status code: {response.status_code}")
-
-                    # 获取文件大小
-                    total_size = int(response.headers.get('content-length', 0))
-
-                    # 下载文件并显示进度
-                    block_size = 1024 * 1024  # 1MB
-                    downloaded_size = 0
-
-                    with open(zip_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=block_size):
-                            if chunk:
-                                f.write(chunk)
-                                downloaded_size += len(chunk)
-                                progress = (downloaded_size / total_size) * 100
-                                self.logger.debug(f"Download progress: {progress:.1f}%")
-
-                # 解压Chrome
-                self.logger.info("Extracting Chrome...")
-                try:
-                    with zipfile.ZipFile(zip_path, 'r') as zf:
-                        zf.extractall(chrome_dir)
-                except zipfile.BadZipFile as e:
-                    raise Exception(f"Failed to extract Chrome package: {str(e)}")
-
-                # 设置执行权限
-                if system in ['linux', 'darwin']:
-                    if system == 'darwin':
-                        # Mac 平台设置应用程序包的权限
-                        os.system(f'xattr -rd com.apple.quarantine "{chrome_app}"')
-                        # 递归设置执行权限
-                        os.system(f'chmod -R +x "{chrome_app}"')
-                    else:
-                        # Linux 只需要设置可执行文件权限
-                        chrome_exe.chmod(0o755)
-
-                # 验证应用是否存在
-                if not chrome_app.exists():
-                    raise Exception(f"Chrome application not found at {chrome_app}")
+                # 下载和解压是阻塞操作，放到线程中执行，避免阻塞事件循环
+                await asyncio.to_thread(
+                    self._install_chrome, system, platform_path, chrome_dir, chrome_exe, chrome_app, zip_name
+                )
 
             # 更新数据库中的 Chrome 路径
             chrome_path = str(chrome_exe)
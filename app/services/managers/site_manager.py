@@ -3,6 +3,8 @@ import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import orjson
+
 from core.logger import get_logger, setup_logger
 from models.models import (BrowserState, Crawler, CrawlerConfig,
                            CrawlerCredential, SiteConfig)
@@ -99,9 +101,9 @@ class SiteManager:
                             if local_setup.site_config:
                                 # 转换配置数据，确保URL是字符串，字典转为JSON
                                 site_config_data = local_setup.site_config.model_dump()
-                                site_config_data['login_config'] = json.dumps(site_config_data['login_config'])
-                                site_config_data['extract_rules'] = json.dumps(site_config_data['extract_rules'])
-                                site_config_data['checkin_config'] = json.dumps(site_config_data['checkin_config'])
+                                site_config_data['login_config'] = orjson.dumps(site_config_data['login_config']).decode()
+                                site_config_data['extract_rules'] = orjson.dumps(site_config_data['extract_rules']).decode()
+                                site_config_data['checkin_config'] = orjson.dumps(site_config_data['checkin_config']).decode()
                                 db.add(SiteConfig(**site_config_data))
                             if local_setup.crawler_config:
                                 db.add(CrawlerConfig(**local_setup.crawler_config.model_dump()))
@@ -195,9 +197,9 @@ class SiteManager:
                 # 转换配置数据为字典
                 site_config_data = new_site_config.model_dump()
                 # 将需要JSON序列化的字段转换为字符串
-                site_config_data['login_config'] = json.dumps(site_config_data.get('login_config'))
-                site_config_data['extract_rules'] = json.dumps(site_config_data.get('extract_rules'))
-                site_config_data['checkin_config'] = json.dumps(site_config_data.get('checkin_config'))
+                site_config_data['login_config'] = orjson.dumps(site_config_data.get('login_config')).decode()
+                site_config_data['extract_rules'] = orjson.dumps(site_config_data.get('extract_rules')).decode()
+                site_config_data['checkin_config'] = orjson.dumps(site_config_data.get('checkin_config')).decode()
                 self.logger.debug("JSON序列化完成")
                 
                 # 检查是否存在现有配置
@@ -406,8 +408,8 @@ class SiteManager:
                 self.logger.warning(f"{site_id}.json 未找到")
                 return None
             
-            with open(site_config_path, 'r', encoding='utf-8') as f:
-                site_config_data = json.load(f)
+            with open(site_config_path, 'rb') as f:
+                site_config_data = orjson.loads(f.read())
             self.logger.info(f"加载站点配置文件: {site_config_path}")
 
             # 3. 读取凭证配置
@@ -415,8 +417,8 @@ class SiteManager:
             credential_path = os.path.join(credential_dir, "credentials.json")
             credential_data = {}
             if os.path.exists(credential_path):
-                with open(credential_path, 'r', encoding='utf-8') as f:
-                    all_credentials = json.load(f)
+                with open(credential_path, 'rb') as f:
+                    all_credentials = orjson.loads(f.read())
                     # 优先使用站点特定凭证，如果没有则使用全局凭证
                     if site_id in all_credentials and all_credentials[site_id].get("enabled", True):
                         credential_data = all_credentials[site_id]
@@ -525,9 +527,9 @@ class SiteManager:
                 
                 # 转换配置数据
                 site_config_data = site_setup.site_config.model_dump()
-                site_config_data['login_config'] = json.dumps(site_config_data.get('login_config', {}))
-                site_config_data['extract_rules'] = json.dumps(site_config_data.get('extract_rules', {}))
-                site_config_data['checkin_config'] = json.dumps(site_config_data.get('checkin_config', {}))
+                site_config_data['login_config'] = orjson.dumps(site_config_data.get('login_config', {})).decode()
+                site_config_data['extract_rules'] = orjson.dumps(site_config_data.get('extract_rules', {})).decode()
+                site_config_data['checkin_config'] = orjson.dumps(site_config_data.get('checkin_config', {})).decode()
                 
                 if existing_site_config:
                     # 更新现有记录
@@ -718,8 +720,8 @@ class SiteManager:
                 self.logger.error("模板配置文件不存在")
                 return None
             
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template = json.load(f)
+            with open(template_path, 'rb') as f:
+                template = orjson.loads(f.read())
             
             return template
         except Exception as e:
@@ -775,8 +777,8 @@ class SiteManager:
             credential_path = os.path.join(credential_dir, "credentials.json")
             credential_data = {}
             if os.path.exists(credential_path):
-                with open(credential_path, 'r', encoding='utf-8') as f:
-                    all_credentials = json.load(f)
+                with open(credential_path, 'rb') as f:
+                    all_credentials = orjson.loads(f.read())
                     # 优先使用全局凭证
                     if "global" in all_credentials and all_credentials["global"].get("enabled", True):
                         credential_data = all_credentials["global"]
@@ -4,9 +4,13 @@ from typing import Dict, Optional
 
 from core.logger import get_logger
 from models.models import Task, TaskStatus
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# 按任务ID查询任务的预构建语句，避免每次调用重复构建
+_SELECT_TASK_METADATA_STMT = select(Task.task_metadata).where(Task.task_id == bindparam("task_id"))
+SELECT_TASK_STATUS_STMT = select(Task.status).where(Task.task_id == bindparam("task_id"))
+
 
 class TaskStatusManager:
     """任务状态管理器"""
@@ -29,7 +33,7 @@ class TaskStatusManager:
         status: TaskStatus,
         msg: Optional[str] = None,
         completed_at: Optional[datetime] = None,
-        updated_at: Optional[datetime] = datetime.now(),
+        updated_at: Optional[datetime] = None,
         error_details: Optional[Dict] = None,
         task_metadata: Optional[Dict] = None,
         site_id: Optional[str] = None  # 用于日志记录
@@ -42,6 +46,7 @@ class TaskStatusManager:
             status: 新的任务状态
             msg: 状态消息
             completed_at: 完成时间
+            updated_at: 更新时间，默认为当前时间
             error_details: 详细错误信息
             task_metadata: 任务元数据
             site_id: 站点ID（可选，用于日志记录）
@@ -50,40 +55,44 @@ class TaskStatusManager:
             bool: 更新是否成功
         """
         try:
-            stmt = select(Task).where(Task.task_id == task_id)
-            result = await db.execute(stmt)
-            task = result.scalar_one_or_none()
-            
-            if task:
-                task.status = status
-                task.updated_at = datetime.now()
-                
-                if msg:
-                    task.msg = msg
-                if error_details:
-                    task.error_details = error_details
-                if completed_at:
-                    task.completed_at = completed_at
-                if updated_at:
-                    task.updated_at = updated_at
-                if task_metadata:
-                    # 创建新的字典来触发SQLAlchemy的更改检测
-                    current_metadata = dict(task.task_metadata or {})
-                    current_metadata.update(task_metadata)
-                    task.task_metadata = current_metadata  # 重新赋值整个字典
-                    
-                    self.logger.warning(f"更新后的 task_metadata: {task.task_metadata}")
-                
-                # 标记字段为已修改
-                db.add(task)
-                await db.commit()
-                
-                log_context = f"[站点: {site_id or task.site_id}] " if site_id or task.site_id else ""
-                self.logger.info(f"{log_context}任务 {task_id} 状态更新为 {status.value}")
-                if msg:
-                    self.logger.debug(f"{log_context}任务状态消息: {msg}")
+            values = {
+                "status": status,
+                "updated_at": updated_at or datetime.now(),
+            }
+            if msg:
+                values["msg"] = msg
+            if error_details:
+                values["error_details"] = error_details
+            if completed_at:
+                values["completed_at"] = completed_at
+            if task_metadata:
+                # 元数据需要与现有值合并，只查询该列
+                result = await db.execute(_SELECT_TASK_METADATA_STMT, {"task_id": task_id})
+                current_metadata = dict(result.scalar_one_or_none() or {})
+                current_metadata.update(task_metadata)
+                values["task_metadata"] = current_metadata
                 
-                return True
+                self.logger.debug(f"更新后的 task_metadata: {current_metadata}")
+            
+            # 单条 UPDATE 写入，无需先加载 ORM 对象
+            result = await db.execute(
+                update(Task)
+                .where(Task.task_id == task_id)
+                .values(**values)
+                .returning(Task.site_id)
+            )
+            task_site_id = result.scalar_one_or_none()
+            await db.commit()
+            
+            if task_site_id is None:
+                return False
+            
+            log_context = f"[站点: {site_id or task_site_id}] " if site_id or task_site_id else ""
+            self.logger.info(f"{log_context}任务 {task_id} 状态更新为 {status.value}")
+            if msg:
+                self.logger.debug(f"{log_context}任务状态消息: {msg}")
+            
+            return True
                 
         except Exception as e:
             error_msg = str(e)
@@ -93,11 +102,10 @@ class TaskStatusManager:
             return False
     
     async def get_task_status(self, db: AsyncSession, task_id: str) -> TaskStatus:
-        """获取任务状态"""
-        stmt = select(Task).where(Task.task_id == task_id)
-        result = await db.execute(stmt)
-        task = result.scalar_one_or_none()
-        return task.status if task else TaskStatus.READY
+        """获取任务状态，只查询状态列，不构造 ORM 对象"""
+        result = await db.execute(SELECT_TASK_STATUS_STMT, {"task_id": task_id})
+        task_status = result.scalar_one_or_none()
+        return task_status if task_status is not None else TaskStatus.READY
 
 # 全局任务状态管理器实例
 task_status_manager = TaskStatusManager.get_instance() 
\ No newline at end of file
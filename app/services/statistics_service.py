@@ -12,6 +12,16 @@ from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 
+# 流式查询每批次读取的行数
+_STREAM_BATCH_SIZE = 1000
+
+# 每日结果统计从 Result 表读取的字段
+_DAILY_RESULT_FIELDS = (
+    "username", "user_class", "uid", "join_time", "last_active",
+    "upload", "download", "ratio", "bonus", "seeding_score",
+    "hr_count", "bonus_per_hour", "seeding_size", "seeding_count",
+)
+
 
 class StatisticsService:
     def __init__(self):
@@ -89,9 +99,14 @@ class StatisticsService:
     ) -> List[DailyResult]:
         """获取每日最后结果统计"""
         try:
-            # 构建基础查询
+            # 构建基础查询，只读取需要的列，结果为轻量的行元组而非 ORM 对象
             query = (
-                select(Task, Result)
+                select(
+                    Task.task_id,
+                    Task.site_id,
+                    Task.created_at,
+                    *(getattr(Result, field) for field in _DAILY_RESULT_FIELDS)
+                )
                 .join(Result, Task.task_id == Result.task_id)
                 .where(
                     and_(
@@ -106,41 +121,26 @@ class StatisticsService:
             if site_id:
                 query = query.where(Task.site_id == site_id)
             
-            # 执行查询
-            result = await db.execute(query)
-            rows = result.all()
+            # 流式执行查询，按批次处理，避免一次性加载全部结果
+            stream = await db.stream(query.execution_options(yield_per=_STREAM_BATCH_SIZE))
             
             # 按日期和站点分组，获取每天的最后一条记录
             daily_results = {}
-            task: Task
-            result: Result
-            for task, result in rows:
-                key = (task.site_id, task.created_at.date())
-                if key not in daily_results or task.created_at > daily_results[key][0].created_at:
-                    daily_results[key] = (task, result)
+            async for partition in stream.partitions():
+                for row in partition:
+                    key = (row.site_id, row.created_at.date())
+                    if key not in daily_results or row.created_at > daily_results[key].created_at:
+                        daily_results[key] = row
             
             # 转换为响应格式
             return [
                 DailyResult(
-                    date=task.created_at.date(),
-                    site_id=task.site_id,
-                    username=result.username,
-                    user_class=result.user_class,
-                    uid=result.uid,
-                    join_time=result.join_time,
-                    last_active=result.last_active,
-                    upload=result.upload,
-                    download=result.download,
-                    ratio=result.ratio,
-                    bonus=result.bonus,
-                    seeding_score=result.seeding_score,
-                    hr_count=result.hr_count,
-                    bonus_per_hour=result.bonus_per_hour,
-                    seeding_size=result.seeding_size,
-                    seeding_count=result.seeding_count,
-                    task_id=task.task_id
+                    date=row.created_at.date(),
+                    site_id=row.site_id,
+                    task_id=row.task_id,
+                    **{field: getattr(row, field) for field in _DAILY_RESULT_FIELDS}
                 )
-                for (_, _), (task, result) in daily_results.items()
+                for row in daily_results.values()
             ]
             
         except Exception as e:
@@ -210,9 +210,14 @@ class StatisticsService:
     ) -> List[CheckInResult]:
         """获取签到结果统计"""
         try:
-            # 构建查询
+            # 构建查询，只读取需要的列
             query = (
-                select(Task, DBCheckInResult)
+                select(
+                    Task.task_id,
+                    Task.site_id,
+                    DBCheckInResult.checkin_date,
+                    DBCheckInResult.result
+                )
                 .join(DBCheckInResult, Task.task_id == DBCheckInResult.task_id)
                 .where(
                     and_(
@@ -226,39 +231,37 @@ class StatisticsService:
             if site_id:
                 query = query.where(Task.site_id == site_id)
             
-            # 执行查询
-            result = await db.execute(query)
-            rows = result.all()
+            # 流式执行查询，按批次处理，避免一次性加载全部结果
+            stream = await db.stream(query.execution_options(yield_per=_STREAM_BATCH_SIZE))
             
             # 按日期和站点分组，处理多次签到结果
             daily_checkins = {}
-            for task, checkin in rows:
-                # 使用签到日期的日期部分作为键
-                key = (task.site_id, checkin.checkin_date.date())
-                current_result = checkin.result.lower()
-                
-                if key not in daily_checkins:
-                    daily_checkins[key] = {
-                        'task': task,
-                        'checkin': checkin,
-                        'success': current_result in ['success', 'already']
-                    }
-                else:
-                    # 如果当前结果是成功的，更新为最新的成功记录
-                    if current_result in ['success', 'already']:
-                        daily_checkins[key]['success'] = True
-                        if checkin.checkin_date > daily_checkins[key]['checkin'].checkin_date:
-                            daily_checkins[key]['task'] = task
-                            daily_checkins[key]['checkin'] = checkin
+            async for partition in stream.partitions():
+                for row in partition:
+                    # 使用签到日期的日期部分作为键
+                    key = (row.site_id, row.checkin_date.date())
+                    current_result = row.result.lower()
+                    
+                    if key not in daily_checkins:
+                        daily_checkins[key] = {
+                            'row': row,
+                            'success': current_result in ['success', 'already']
+                        }
+                    else:
+                        # 如果当前结果是成功的，更新为最新的成功记录
+                        if current_result in ['success', 'already']:
+                            daily_checkins[key]['success'] = True
+                            if row.checkin_date > daily_checkins[key]['row'].checkin_date:
+                                daily_checkins[key]['row'] = row
             
             # 转换为响应格式
             return [
                 CheckInResult(
-                    date=info['checkin'].checkin_date.date(),
-                    site_id=info['task'].site_id,
+                    date=info['row'].checkin_date.date(),
+                    site_id=info['row'].site_id,
                     checkin_status='success' if info['success'] else 'failed',
-                    checkin_time=info['checkin'].checkin_date,
-                    task_id=info['task'].task_id
+                    checkin_time=info['row'].checkin_date,
+                    task_id=info['row'].task_id
                 )
                 for key, info in daily_checkins.items()
             ]